@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from typing import Optional
 from datetime import date, timedelta
 import logging
 
-from database import get_db
+from database import get_read_db
 from models.user import User
 from models.transaction import Transaction
 from models.goal import Goal
@@ -22,7 +23,7 @@ logger = logging.getLogger(__name__)
 async def get_enhanced_financial_analysis(
     period_days: int = 30,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get comprehensive AI-powered financial analysis with structured recommendations and insights"""
     
@@ -31,14 +32,18 @@ async def get_enhanced_financial_analysis(
         end_date = date.today()
         start_date = end_date - timedelta(days=period_days)
         
-        transactions = db.query(Transaction).filter(
-            Transaction.user_id == current_user.id,
-            Transaction.date >= start_date,
-            Transaction.date <= end_date
-        ).all()
+        result = await db.execute(
+            select(Transaction).where(
+                Transaction.user_id == current_user.id,
+                Transaction.date >= start_date,
+                Transaction.date <= end_date
+            )
+        )
+        transactions = result.scalars().all()
         
         # Get user's goals
-        goals = db.query(Goal).filter(Goal.user_id == current_user.id).all()
+        result = await db.execute(select(Goal).where(Goal.user_id == current_user.id))
+        goals = result.scalars().all()
         
         # Prepare data for AI analysis
         user_spending = {}
@@ -160,7 +165,7 @@ async def process_receipt_ocr(
 async def custom_ai_query(
     request: AIPromptRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Ask custom questions to AI about your financial data"""
     
@@ -183,11 +188,14 @@ async def custom_ai_query(
             end_date = date.today()
             start_date = end_date - timedelta(days=request.period_days)
             
-            transactions = db.query(Transaction).filter(
-                Transaction.user_id == current_user.id,
-                Transaction.date >= start_date,
-                Transaction.date <= end_date
-            ).all()
+            result = await db.execute(
+                select(Transaction).where(
+                    Transaction.user_id == current_user.id,
+                    Transaction.date >= start_date,
+                    Transaction.date <= end_date
+                )
+            )
+            transactions = result.scalars().all()
             
             user_data['transactions'] = [
                 {
@@ -201,7 +209,8 @@ async def custom_ai_query(
             ]
         
         if request.include_goals:
-            goals = db.query(Goal).filter(Goal.user_id == current_user.id).all()
+            result = await db.execute(select(Goal).where(Goal.user_id == current_user.id))
+            goals = result.scalars().all()
             goals_list = []
             for g in goals:
                 # Calculate progress for each goal
@@ -1,54 +1,79 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, extract
-from typing import Dict, Any, Optional
-from datetime import date, datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select
+from typing import Dict, Any, List, Optional
+from datetime import date, timedelta
 from decimal import Decimal
 import calendar
 
-from database import get_db
+from database import get_read_db
 from models.user import User
-from models.transaction import Transaction, TransactionType, ExpenseCategory
+from models.transaction import TransactionType, ExpenseCategory
 from models.goal import Goal
+from models.daily_total import DailyUserCategoryTotal
 from api.auth import get_current_user
+from api.etag import conditional_get
+from api.users import build_user_profile
+from api.responses import json_response
 from services.budget_calculator import BudgetCalculator
+from services.analytics_rollup import AnalyticsRollup, INTERVALS
+from services.analytics_cache import analytics_cache
 from services.ai_service import AIService
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
+# Longest range /analytics/timeseries serves (daily points for ten years)
+MAX_TIMESERIES_DAYS = 3660
 
-@router.get("/daily-budget")
+
+def build_daily_budget(current_user: User, active_goals: List[Goal], today: date) -> Dict[str, Any]:
+    """Daily budget, money needed per day and goal timing from already-loaded active goals"""
+    # Use BudgetCalculator service
+    budget_info = BudgetCalculator.calculate_daily_budget(current_user, active_goals)
+    
+    # Add money needed per day calculation
+    money_needed_info = BudgetCalculator.calculate_money_needed_per_day(current_user, active_goals)
+    
+    # Add goal information
+    active_goals_count = len(active_goals)
+    days_until_earliest_goal = None
+    if active_goals:
+        earliest_goal = min(active_goals, key=lambda g: g.deadline)
+        days_until_earliest_goal = (earliest_goal.deadline - today).days
+    
+    return {
+        **budget_info,
+        **money_needed_info,
+        "active_goals_count": active_goals_count,
+        "days_until_earliest_goal": days_until_earliest_goal
+    }
+
+
+async def compute_daily_budget(db: AsyncSession, current_user: User) -> Dict[str, Any]:
+    """Daily budget, money needed per day and goal timing for a user"""
+    # Get active goals
+    today = date.today()
+    result = await db.execute(
+        select(Goal).where(
+            and_(Goal.user_id == current_user.id, Goal.deadline >= today)
+        )
+    )
+    return build_daily_budget(current_user, result.scalars().all(), today)
+
+
+@router.get("/daily-budget", dependencies=[Depends(conditional_get)])
 async def get_daily_budget(
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Calculate current daily budget based on income and goals"""
     try:
-        # Get active goals
-        active_goals = db.query(Goal).filter(
-            and_(Goal.user_id == current_user.id, Goal.deadline >= date.today())
-        ).all()
-        
-        # Use BudgetCalculator service
-        budget_info = BudgetCalculator.calculate_daily_budget(current_user, active_goals)
-        
-        # Add money needed per day calculation
-        money_needed_info = BudgetCalculator.calculate_money_needed_per_day(current_user, active_goals)
-        
-        # Add goal information
-        active_goals_count = len(active_goals)
-        days_until_earliest_goal = None
-        if active_goals:
-            earliest_goal = min(active_goals, key=lambda g: g.deadline)
-            days_until_earliest_goal = (earliest_goal.deadline - date.today()).days
-        
-        return {
-            **budget_info,
-            **money_needed_info,
-            "active_goals_count": active_goals_count,
-            "days_until_earliest_goal": days_until_earliest_goal
-        }
-        
+        return json_response(await analytics_cache.get_or_compute(
+            current_user, "daily-budget", {"today": date.today()}, db,
+            lambda session: compute_daily_budget(session, current_user)
+        ), response)
+    
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -56,67 +81,78 @@ async def get_daily_budget(
         )
 
 
-@router.get("/daily-report")
+def build_daily_report(
+    current_user: User, totals: List[DailyUserCategoryTotal], active_goals: List[Goal], report_date: date
+) -> Dict[str, Any]:
+    """Daily spending report from the day's rollup rows and the goals active on that date"""
+    # Calculate totals
+    total_income = sum(t.total for t in totals if t.type == TransactionType.INCOME)
+    total_expenses = sum(t.total for t in totals if t.type == TransactionType.EXPENSE)
+    net_change = total_income - total_expenses
+    
+    # Category breakdown for expenses
+    category_breakdown = {}
+    for total in totals:
+        if total.type == TransactionType.EXPENSE and total.category:
+            category_breakdown[total.category] = category_breakdown.get(total.category, 0) + float(total.total)
+    
+    # Get daily budget for comparison using BudgetCalculator
+    budget_info = BudgetCalculator.calculate_daily_budget(current_user, active_goals, report_date)
+    daily_budget = budget_info["daily_budget_with_multiplier"]
+    
+    # Generate insights using AIService (per-category sums stand in for the transactions)
+    transaction_data = [
+        {
+            "amount": float(t.total),
+            "type": t.type.value,
+            "category": t.category or None
+        }
+        for t in totals
+    ]
+    insights = AIService.generate_spending_insights(transaction_data, daily_budget, 1)
+    
+    return {
+        "date": report_date,
+        "total_income": float(total_income),
+        "total_expenses": float(total_expenses),
+        "net_change": float(net_change),
+        "daily_budget": daily_budget,
+        "budget_remaining": daily_budget - float(total_expenses),
+        "category_breakdown": category_breakdown,
+        "transaction_count": sum(t.count for t in totals),
+        "insights": insights
+    }
+
+
+async def compute_daily_report(db: AsyncSession, current_user: User, report_date: date) -> Dict[str, Any]:
+    """Daily spending report for one date"""
+    # Get the day's rollup rows (one per type and category) and the goals active that day
+    totals = await AnalyticsRollup.totals(db, current_user.id, report_date, report_date)
+    result = await db.execute(
+        select(Goal).where(
+            and_(Goal.user_id == current_user.id, Goal.deadline >= report_date)
+        )
+    )
+    return build_daily_report(current_user, totals, result.scalars().all(), report_date)
+
+
+@router.get("/daily-report", dependencies=[Depends(conditional_get)])
 async def get_daily_report(
+    response: Response,
     report_date: Optional[date] = Query(None, description="Date for report (default: today)"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get AI-generated daily spending report"""
     if not report_date:
         report_date = date.today()
     
     try:
-        # Get transactions for the day
-        transactions = db.query(Transaction).filter(
-            and_(
-                Transaction.user_id == current_user.id,
-                Transaction.date == report_date
-            )
-        ).all()
-        
-        # Calculate totals
-        total_income = sum(t.amount for t in transactions if t.type == TransactionType.INCOME)
-        total_expenses = sum(t.amount for t in transactions if t.type == TransactionType.EXPENSE)
-        net_change = total_income - total_expenses
-        
-        # Category breakdown for expenses
-        category_breakdown = {}
-        for transaction in transactions:
-            if transaction.type == TransactionType.EXPENSE and transaction.category:
-                category = transaction.category.value
-                category_breakdown[category] = category_breakdown.get(category, 0) + float(transaction.amount)
-        
-        # Get daily budget for comparison using BudgetCalculator
-        active_goals = db.query(Goal).filter(
-            and_(Goal.user_id == current_user.id, Goal.deadline >= report_date)
-        ).all()
-        budget_info = BudgetCalculator.calculate_daily_budget(current_user, active_goals, report_date)
-        daily_budget = budget_info["daily_budget_with_multiplier"]
-        
-        # Generate insights using AIService
-        transaction_data = [
-            {
-                "amount": float(t.amount),
-                "type": t.type.value,
-                "category": t.category.value if t.category else None
-            }
-            for t in transactions
-        ]
-        insights = AIService.generate_spending_insights(transaction_data, daily_budget, 1)
-        
-        return {
-            "date": report_date,
-            "total_income": float(total_income),
-            "total_expenses": float(total_expenses),
-            "net_change": float(net_change),
-            "daily_budget": daily_budget,
-            "budget_remaining": daily_budget - float(total_expenses),
-            "category_breakdown": category_breakdown,
-            "transaction_count": len(transactions),
-            "insights": insights
-        }
-        
+        return json_response(await analytics_cache.get_or_compute(
+            current_user, "daily-report", {"report_date": report_date}, db,
+            lambda session: compute_daily_report(session, current_user, report_date)
+        ), response)
+    
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -124,12 +160,55 @@ async def get_daily_report(
         )
 
 
-@router.get("/monthly-report")
+async def compute_monthly_report(db: AsyncSession, current_user: User, year: int, month: int) -> Dict[str, Any]:
+    """Monthly income vs expense summary from grouped rollup aggregates"""
+    # Date-range predicates keep the (user_id, date) key usable; SQL returns one row per
+    # day/type and per category, however many transactions the month holds
+    start_date = date(year, month, 1)
+    end_date = date(year, month, calendar.monthrange(year, month)[1])
+    daily_sums = await AnalyticsRollup.daily_sums(db, current_user.id, start_date, end_date)
+    category_sums = await AnalyticsRollup.category_sums(db, current_user.id, start_date, end_date)
+    
+    # Daily breakdown
+    daily_breakdown = {}
+    total_income = Decimal(0)
+    total_expenses = Decimal(0)
+    for row in daily_sums:
+        day = row.date.day
+        if day not in daily_breakdown:
+            daily_breakdown[day] = {"income": 0, "expenses": 0}
+        
+        if row.type == TransactionType.INCOME:
+            daily_breakdown[day]["income"] = float(row.total)
+            total_income += row.total
+        else:
+            daily_breakdown[day]["expenses"] = float(row.total)
+            total_expenses += row.total
+    
+    # Use BudgetCalculator service for analysis
+    analysis = BudgetCalculator.analyze_spending_totals(
+        total_income,
+        total_expenses,
+        {row.category: float(row.total) for row in category_sums},
+        start_date,
+        end_date
+    )
+    
+    return {
+        "year": year,
+        "month": month,
+        **analysis,
+        "daily_breakdown": daily_breakdown
+    }
+
+
+@router.get("/monthly-report", dependencies=[Depends(conditional_get)])
 async def get_monthly_report(
+    response: Response,
     year: Optional[int] = Query(None, description="Year for report"),
     month: Optional[int] = Query(None, description="Month for report (1-12)"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get monthly income vs expense summary"""
     if not year:
@@ -138,39 +217,11 @@ async def get_monthly_report(
         month = date.today().month
     
     try:
-        # Get transactions for the month
-        transactions = db.query(Transaction).filter(
-            and_(
-                Transaction.user_id == current_user.id,
-                extract('year', Transaction.date) == year,
-                extract('month', Transaction.date) == month
-            )
-        ).all()
-        
-        # Use BudgetCalculator service for analysis
-        start_date = date(year, month, 1)
-        end_date = date(year, month, calendar.monthrange(year, month)[1])
-        analysis = BudgetCalculator.analyze_spending_pattern(transactions, start_date, end_date)
-        
-        # Daily breakdown
-        daily_breakdown = {}
-        for transaction in transactions:
-            day = transaction.date.day
-            if day not in daily_breakdown:
-                daily_breakdown[day] = {"income": 0, "expenses": 0}
-            
-            if transaction.type == TransactionType.INCOME:
-                daily_breakdown[day]["income"] += float(transaction.amount)
-            else:
-                daily_breakdown[day]["expenses"] += float(transaction.amount)
-        
-        return {
-            "year": year,
-            "month": month,
-            **analysis,
-            "daily_breakdown": daily_breakdown
-        }
-        
+        return json_response(await analytics_cache.get_or_compute(
+            current_user, "monthly-report", {"year": year, "month": month}, db,
+            lambda session: compute_monthly_report(session, current_user, year, month)
+        ), response)
+    
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -178,12 +229,62 @@ async def get_monthly_report(
         )
 
 
-@router.get("/category-breakdown")
+async def compute_category_breakdown(
+    db: AsyncSession, current_user: User, start_date: date, end_date: date, top: int
+) -> Dict[str, Any]:
+    """Expense totals, percentages and top categories for a date range"""
+    # SUM/COUNT ... GROUP BY category in SQL: one row per category, largest first
+    category_sums = await AnalyticsRollup.category_sums(
+        db, current_user.id, start_date, end_date, include_uncategorized=True
+    )
+    category_totals = {row.category: float(row.total) for row in category_sums if row.category}
+    
+    # Use BudgetCalculator service for analysis
+    analysis = BudgetCalculator.analyze_spending_totals(
+        Decimal(0),
+        sum((row.total for row in category_sums), Decimal(0)),
+        category_totals,
+        start_date,
+        end_date
+    )
+    
+    # Calculate percentages and top categories on the summarized rows
+    total_expenses = analysis["total_expenses"]
+    category_percentages = {}
+    if total_expenses > 0:
+        for category, amount in category_totals.items():
+            category_percentages[category] = (amount / total_expenses) * 100
+    
+    top_categories = [
+        {
+            "category": row.category,
+            "total": float(row.total),
+            "count": row.count,
+            "percentage": category_percentages.get(row.category, 0)
+        }
+        for row in category_sums if row.category
+    ][:top]
+    
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "total_expenses": total_expenses,
+        "category_totals": category_totals,
+        "category_percentages": category_percentages,
+        "top_categories": top_categories,
+        "transaction_count": sum(row.count for row in category_sums),
+        "insights": analysis["insights"]
+    }
+
+
+@router.get("/category-breakdown", dependencies=[Depends(conditional_get)])
 async def get_category_breakdown(
+    response: Response,
     start_date: Optional[date] = Query(None, description="Start date"),
     end_date: Optional[date] = Query(None, description="End date"),
+    top: int = Query(5, ge=1, le=len(ExpenseCategory), description="Number of top categories to return"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get spending breakdown by category"""
     if not start_date:
@@ -192,88 +293,200 @@ async def get_category_breakdown(
         end_date = date.today()
     
     try:
-        # Get expense transactions in date range
-        expenses = db.query(Transaction).filter(
-            and_(
-                Transaction.user_id == current_user.id,
-                Transaction.type == TransactionType.EXPENSE,
-                Transaction.date >= start_date,
-                Transaction.date <= end_date
-            )
-        ).all()
-        
-        # Use BudgetCalculator service for analysis
-        analysis = BudgetCalculator.analyze_spending_pattern(expenses, start_date, end_date)
-        
-        # Calculate percentages
-        category_totals = analysis["category_breakdown"]
-        total_expenses = analysis["total_expenses"]
-        category_percentages = {}
-        if total_expenses > 0:
-            for category, amount in category_totals.items():
-                category_percentages[category] = (amount / total_expenses) * 100
-        
-        return {
-            "start_date": start_date,
-            "end_date": end_date,
-            "total_expenses": total_expenses,
-            "category_totals": category_totals,
-            "category_percentages": category_percentages,
-            "transaction_count": len(expenses),
-            "insights": analysis["insights"]
-        }
-        
+        return json_response(await analytics_cache.get_or_compute(
+            current_user, "category-breakdown", {"start_date": start_date, "end_date": end_date, "top": top}, db,
+            lambda session: compute_category_breakdown(session, current_user, start_date, end_date, top)
+        ), response)
+    
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                         detail=f"Failed to generate category breakdown: {str(e)}"
-         )
+            detail=f"Failed to generate category breakdown: {str(e)}"
+        )
 
 
-@router.get("/goal-progress")
-async def get_goal_progress(
+async def compute_timeseries(
+    db: AsyncSession, current_user: User, start_date: date, end_date: date, interval: str, by_category: bool
+) -> Dict[str, Any]:
+    """Income/expense/net per bucket over a date range, with empty buckets filled in"""
+    # SQL returns one row per bucket/type (and category), however many transactions the range holds
+    rows = await AnalyticsRollup.period_sums(db, current_user.id, start_date, end_date, interval, by_category)
+    
+    points = {}
+    period = AnalyticsRollup.period_start(start_date, interval)
+    while period <= end_date:
+        points[period] = {"period_start": period, "income": 0.0, "expenses": 0.0, "net": 0.0, "transaction_count": 0}
+        if by_category:
+            points[period]["categories"] = {}
+        period = AnalyticsRollup.next_period(period, interval)
+    
+    for row in rows:
+        point = points[row.period]
+        amount = float(row.total)
+        if row.type == TransactionType.INCOME:
+            point["income"] += amount
+            point["net"] += amount
+        else:
+            point["expenses"] += amount
+            point["net"] -= amount
+            if by_category and row.category:
+                point["categories"][row.category] = point["categories"].get(row.category, 0) + amount
+        point["transaction_count"] += row.count
+    
+    series = list(points.values())
+    total_income = sum(point["income"] for point in series)
+    total_expenses = sum(point["expenses"] for point in series)
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "interval": interval,
+        "points": series,
+        "total_income": total_income,
+        "total_expenses": total_expenses,
+        "net": total_income - total_expenses
+    }
+
+
+@router.get("/timeseries", dependencies=[Depends(conditional_get)])
+async def get_timeseries(
+    response: Response,
+    start_date: Optional[date] = Query(None, description="Start date (default: 30 days ago)"),
+    end_date: Optional[date] = Query(None, description="End date (default: today)"),
+    interval: str = Query("day", pattern=f"^({'|'.join(INTERVALS)})$", description="Bucket size: day, week or month"),
+    by_category: bool = Query(False, description="Split each bucket's expenses by category"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get progress tracking for all user goals"""
+    """Get income, expenses and net per day, week or month for any date range"""
+    if not end_date:
+        end_date = date.today()
+    if not start_date:
+        start_date = end_date - timedelta(days=30)
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
+        )
+    if (end_date - start_date).days > MAX_TIMESERIES_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range cannot exceed {MAX_TIMESERIES_DAYS} days"
+        )
+    
     try:
-        # Get all user goals
-        goals = db.query(Goal).filter(Goal.user_id == current_user.id).all()
-        
-        if not goals:
-            return {
-                "goals": [],
-                "total_goals": 0,
-                "overall_progress": 0
-            }
-        
-        goal_progress = []
-        total_progress = 0
-        
-        for goal in goals:
-            progress = BudgetCalculator.calculate_goal_progress(goal, current_user.current_amount)
-            goal_data = {
-                "id": str(goal.id),
-                "title": goal.title,
-                "target_amount": float(goal.target_amount),
-                "deadline": goal.deadline,
-                "current_amount": float(current_user.current_amount),
-                **progress
-            }
-            goal_progress.append(goal_data)
-            total_progress += progress["progress_percentage"]
-        
-        # Calculate overall progress
-        overall_progress = total_progress / len(goals) if goals else 0
-        
+        return json_response(await analytics_cache.get_or_compute(
+            current_user, "timeseries",
+            {"start_date": start_date, "end_date": end_date, "interval": interval, "by_category": by_category}, db,
+            lambda session: compute_timeseries(session, current_user, start_date, end_date, interval, by_category)
+        ), response)
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to generate timeseries: {str(e)}"
+        )
+
+
+def build_goal_progress(current_user: User, goals: List[Goal]) -> Dict[str, Any]:
+    """Progress of already-loaded goals against the user's current amount"""
+    if not goals:
         return {
-            "goals": goal_progress,
-            "total_goals": len(goals),
-            "overall_progress": overall_progress
+            "goals": [],
+            "total_goals": 0,
+            "overall_progress": 0
         }
-        
+    
+    goal_progress = []
+    total_progress = 0
+    
+    for goal in goals:
+        progress = BudgetCalculator.calculate_goal_progress(goal, current_user.current_amount)
+        goal_data = {
+            "id": str(goal.id),
+            "title": goal.title,
+            "target_amount": float(goal.target_amount),
+            "deadline": goal.deadline,
+            "current_amount": float(current_user.current_amount),
+            **progress
+        }
+        goal_progress.append(goal_data)
+        total_progress += progress["progress_percentage"]
+    
+    # Calculate overall progress
+    overall_progress = total_progress / len(goals) if goals else 0
+    
+    return {
+        "goals": goal_progress,
+        "total_goals": len(goals),
+        "overall_progress": overall_progress
+    }
+
+
+async def compute_goal_progress(db: AsyncSession, current_user: User) -> Dict[str, Any]:
+    """Progress of every goal against the user's current amount"""
+    # Get all user goals
+    result = await db.execute(select(Goal).where(Goal.user_id == current_user.id))
+    return build_goal_progress(current_user, result.scalars().all())
+
+
+@router.get("/goal-progress", dependencies=[Depends(conditional_get)])
+async def get_goal_progress(
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get progress tracking for all user goals"""
+    try:
+        return json_response(await analytics_cache.get_or_compute(
+            current_user, "goal-progress", {"today": date.today()}, db,
+            lambda session: compute_goal_progress(session, current_user)
+        ), response)
+    
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to calculate goal progress: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+
+
+async def compute_dashboard(db: AsyncSession, current_user: User, today: date) -> Dict[str, Any]:
+    """
+    Every dashboard view from one goals query and three rollup queries: the goals are loaded once
+    (active ones filtered in Python) and today's report, the month's report and goal progress share them
+    """
+    result = await db.execute(select(Goal).where(Goal.user_id == current_user.id))
+    goals = result.scalars().all()
+    active_goals = [goal for goal in goals if goal.deadline >= today]
+    totals = await AnalyticsRollup.totals(db, current_user.id, today, today)
+    
+    return {
+        "profile": build_user_profile(current_user, len(goals)).model_dump(mode="json"),
+        "daily_budget": build_daily_budget(current_user, active_goals, today),
+        "daily_report": build_daily_report(current_user, totals, active_goals, today),
+        "monthly_report": await compute_monthly_report(db, current_user, today.year, today.month),
+        "goal_progress": build_goal_progress(current_user, goals)
+    }
+
+
+@router.get("/dashboard", dependencies=[Depends(conditional_get)])
+async def get_dashboard(
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Profile, daily budget, today's report, this month's report and goal progress in one response
+    (the same payloads as /user/profile and the individual analytics endpoints)
+    """
+    today = date.today()
+    try:
+        return json_response(await analytics_cache.get_or_compute(
+            current_user, "dashboard", {"today": today}, db,
+            lambda session: compute_dashboard(session, current_user, today)
+        ), response)
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to build dashboard: {str(e)}"
+        )
\ No newline at end of file
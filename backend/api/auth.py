@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from typing import Optional
 import jwt
 from datetime import datetime, timedelta
@@ -61,9 +62,9 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security))
         )
 
 
-def get_current_user(token_data: TokenData = Depends(verify_token), db: Session = Depends(get_db)) -> User:
+async def get_current_user(token_data: TokenData = Depends(verify_token), db: AsyncSession = Depends(get_db)) -> User:
     """Get current authenticated user"""
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    user = await db.get(User, token_data.user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -73,7 +74,7 @@ def get_current_user(token_data: TokenData = Depends(verify_token), db: Session
 
 
 @router.post("/google", response_model=Token)
-async def google_auth(auth_request: GoogleAuthRequest, db: Session = Depends(get_db)):
+async def google_auth(auth_request: GoogleAuthRequest, db: AsyncSession = Depends(get_db)):
     """Authenticate user with Google OAuth"""
     try:
         # Verify Google ID token
@@ -95,7 +96,8 @@ async def google_auth(auth_request: GoogleAuthRequest, db: Session = Depends(get
             )
         
         # Check if user exists
-        user = db.query(User).filter(User.email == email).first()
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalars().first()
         
         if not user:
             # Create new user
@@ -106,8 +108,8 @@ async def google_auth(auth_request: GoogleAuthRequest, db: Session = Depends(get
             )
             user = User(**user_data.dict())
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
         
         # Create access token
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -0,0 +1,156 @@
+import zlib
+from typing import Optional
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+GZIP_LEVEL = 6
+# Quality 4 compresses JSON close to gzip -9 at a fraction of the CPU; 11 is for static assets
+BROTLI_QUALITY = 4
+
+# Bodies that are already compressed gain nothing from another pass
+INCOMPRESSIBLE_TYPES = ("image/", "application/pdf", "application/zip", "application/vnd.apache.parquet")
+
+
+class GzipEncoder:
+    """Incremental gzip stream"""
+    
+    name = "gzip"
+    
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+    
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    """Incremental brotli stream"""
+    
+    name = "br"
+    
+    def __init__(self):
+        self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+    
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+    
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+ENCODERS = {"br": BrotliEncoder, "gzip": GzipEncoder}
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br over gzip from an Accept-Encoding header, honouring q=0 refusals"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        params = params.replace(" ", "")
+        try:
+            if params.startswith("q=") and float(params[2:]) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.strip())
+    for encoding in ENCODERS:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies of at least `minimum_size` bytes with brotli or gzip, whichever the
+    client prefers (br first). Streamed responses are compressed chunk by chunk and flushed, so
+    exports keep streaming. Responses that already carry a Content-Encoding are left untouched.
+    """
+    
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+            if encoding:
+                responder = CompressionResponder(self.app, self.minimum_size, ENCODERS[encoding])
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class CompressionResponder:
+    """Wraps `send` for one request, holding back the start message until the first body chunk"""
+    
+    def __init__(self, app: ASGIApp, minimum_size: int, encoder_class):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoder_class = encoder_class
+        self.encoder = None
+        self.send: Send = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+    
+    async def send_compressed(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Hold the start message until the first chunk shows whether to compress
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = "content-encoding" in headers or headers.get("content-type", "").startswith(INCOMPRESSIBLE_TYPES)
+            return
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+        
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        
+        if not self.started:
+            self.started = True
+            if self.passthrough or (len(body) < self.minimum_size and not more_body):
+                self.passthrough = True
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+            
+            self.encoder = self.encoder_class()
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.encoder.name
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self.encoder.compress(body) + self.encoder.finish()
+                headers["Content-Length"] = str(len(body))
+                message["body"] = body
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+            await self.send(self.initial_message)
+        elif self.passthrough:
+            await self.send(message)
+            return
+        
+        # Streaming: compress each chunk and flush it so the client sees data as it is produced
+        chunk = self.encoder.compress(body)
+        chunk += self.encoder.flush() if more_body else self.encoder.finish()
+        message["body"] = chunk
+        await self.send(message)
@@ -0,0 +1,47 @@
+from fastapi import Depends, HTTPException, Request, Response, status
+from datetime import date
+import hashlib
+
+from models.user import User
+from api.auth import get_current_user
+
+
+def compute_etag(request: Request, user: User) -> str:
+    """
+    Weak ETag for a user-scoped GET: changes whenever the user writes (data_version),
+    with the request path/query, and daily (for responses relative to today).
+    Weak because the body's content-coding (br/gzip/identity) varies with Accept-Encoding
+    """
+    raw = f"{user.id}:{user.data_version}:{date.today().isoformat()}:{request.url.path}?{request.url.query}"
+    return 'W/"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match comparison (weak, per RFC 9110), including '*'"""
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    opaque = etag.removeprefix("W/")
+    return "*" in candidates or any(candidate.removeprefix("W/") == opaque for candidate in candidates)
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+) -> str:
+    """
+    Route dependency: answer 304 Not Modified before the handler runs when the client's
+    ETag is current, otherwise tag the response
+    The tag carries the primary's data_version, so the body must be at least that new: handlers
+    reading through get_read_db build it with analytics_cache, which falls back to the primary
+    when the replica lags
+    Usage: @router.get(..., dependencies=[Depends(conditional_get)])
+    """
+    etag = compute_etag(request, current_user)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
+    return etag
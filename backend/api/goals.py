@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, desc, select
 from typing import List
 import uuid
 
@@ -9,17 +9,21 @@ from models.user import User
 from models.goal import Goal
 from schemas.goal import GoalCreate, GoalUpdate, GoalResponse, GoalList
 from api.auth import get_current_user
+from api.etag import conditional_get
 
 router = APIRouter(prefix="/goals", tags=["Goals"])
 
 
-@router.get("", response_model=GoalList)
+@router.get("", response_model=GoalList, dependencies=[Depends(conditional_get)])
 async def get_goals(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all user goals"""
-    goals = db.query(Goal).filter(Goal.user_id == current_user.id).order_by(Goal.deadline).all()
+    result = await db.execute(
+        select(Goal).where(Goal.user_id == current_user.id).order_by(Goal.deadline)
+    )
+    goals = result.scalars().all()
     total = len(goals)
     
     return GoalList(goals=goals, total=total)
@@ -29,7 +33,7 @@ async def get_goals(
 async def create_goal(
     goal: GoalCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new financial goal"""
     try:
@@ -39,29 +43,33 @@ async def create_goal(
         )
         
         db.add(db_goal)
-        db.commit()
-        db.refresh(db_goal)
+        current_user.data_version = User.data_version + 1
+        await db.commit()
+        await db.refresh(db_goal)
         
         return db_goal
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create goal: {str(e)}"
         )
 
 
-@router.get("/{goal_id}", response_model=GoalResponse)
+@router.get("/{goal_id}", response_model=GoalResponse, dependencies=[Depends(conditional_get)])
 async def get_goal(
     goal_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get a specific goal by ID"""
-    goal = db.query(Goal).filter(
-        and_(Goal.id == goal_id, Goal.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(Goal).where(
+            and_(Goal.id == goal_id, Goal.user_id == current_user.id)
+        )
+    )
+    goal = result.scalars().first()
     
     if not goal:
         raise HTTPException(
@@ -77,12 +85,15 @@ async def update_goal(
     goal_id: uuid.UUID,
     goal_update: GoalUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a specific goal"""
-    db_goal = db.query(Goal).filter(
-        and_(Goal.id == goal_id, Goal.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(Goal).where(
+            and_(Goal.id == goal_id, Goal.user_id == current_user.id)
+        )
+    )
+    db_goal = result.scalars().first()
     
     if not db_goal:
         raise HTTPException(
@@ -95,14 +106,15 @@ async def update_goal(
         update_data = goal_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_goal, field, value)
+        current_user.data_version = User.data_version + 1
         
-        db.commit()
-        db.refresh(db_goal)
+        await db.commit()
+        await db.refresh(db_goal)
         
         return db_goal
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update goal: {str(e)}"
@@ -113,12 +125,15 @@ async def update_goal(
 async def delete_goal(
     goal_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a specific goal"""
-    goal = db.query(Goal).filter(
-        and_(Goal.id == goal_id, Goal.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(Goal).where(
+            and_(Goal.id == goal_id, Goal.user_id == current_user.id)
+        )
+    )
+    goal = result.scalars().first()
     
     if not goal:
         raise HTTPException(
@@ -127,13 +142,14 @@ async def delete_goal(
         )
     
     try:
-        db.delete(goal)
-        db.commit()
+        await db.delete(goal)
+        current_user.data_version = User.data_version + 1
+        await db.commit()
         
         return {"message": "Goal deleted successfully"}
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete goal: {str(e)}"
@@ -0,0 +1,49 @@
+from decimal import Decimal
+from typing import Any, Optional
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# Non-string dict keys (e.g. day numbers) are written as strings, like json.dumps does
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def encode_extra(value: Any) -> Any:
+    """orjson fallback for types it does not serialize natively (UUID, date, datetime and enums are native)"""
+    if isinstance(value, Decimal):
+        # Same output as FastAPI's encoder: whole amounts as int, the rest as float
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes with orjson"""
+    return orjson.dumps(content, default=encode_extra, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class: renders with orjson instead of json.dumps"""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(content: Any, response: Optional[Response] = None, status_code: int = 200) -> Response:
+    """
+    Render content straight to a response, skipping FastAPI's response_model re-validation and
+    jsonable_encoder pass. Pydantic models are dumped to JSON in Rust without an intermediate dict.
+    Headers set by dependencies on `response` (e.g. ETag) are carried over.
+    """
+    if isinstance(content, BaseModel):
+        rendered = Response(content.__pydantic_serializer__.to_json(content), status_code=status_code, media_type="application/json")
+    else:
+        rendered = FastJSONResponse(content, status_code=status_code)
+    if response is not None:
+        rendered.headers.raw.extend(response.headers.raw)
+    return rendered
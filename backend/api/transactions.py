@@ -1,23 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
-from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, desc, func, select, insert, update, tuple_, table, column, literal_column, text
+from typing import Optional, List, Tuple, Dict, Any, Iterator
 from datetime import date, datetime
+from decimal import Decimal
 import uuid
 import math
+import json
+import base64
 import logging
 
-from database import get_db
+import database
+from database import get_db, get_read_db, estimate_row_count
 from models.user import User
-from models.transaction import Transaction, TransactionType, ExpenseCategory
-from schemas.transaction import TransactionCreate, TransactionUpdate, TransactionResponse, TransactionList
-from schemas.ai import BulkTransactionCreate, BulkTransactionResponse, OCRTransactionItem
+from models.transaction import Transaction, TransactionType, ExpenseCategory, CategorySource
+from schemas.transaction import TransactionCreate, TransactionUpdate, TransactionResponse, TransactionList, TransactionImportResponse
+from schemas.ai import (
+    BulkTransactionCreate, BulkTransactionResponse, OCRTransactionItem,
+    BatchCategorizeRequest, CategorizedDescription, BatchCategorizeResponse
+)
 from api.auth import get_current_user
+from api.etag import conditional_get
+from api.responses import json_response
 from services.ai_service import AIService
+from services.category_cache import CategoryCache
+from services.statement_parser import StatementParser, ParsedEntry
+from services.transaction_export import TransactionExporter, EXPORT_COLUMNS
+from services.analytics_rollup import AnalyticsRollup
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 logger = logging.getLogger(__name__)
 
+# Filtered lists count exactly up to this many rows, then fall back to an estimate
+EXACT_COUNT_LIMIT = 1000
+
+# Largest value a Numeric(12, 2) amount column can hold
+MAX_AMOUNT = Decimal("9999999999.99")
+
+# Statement imports are parsed and written this many rows at a time
+IMPORT_CHUNK_SIZE = 1000
+
+# Exports are fetched through a server-side cursor this many rows at a time
+EXPORT_BATCH_SIZE = 1000
+
+# Only the first errors of an import are reported back
+MAX_IMPORT_ERRORS = 100
+
+# SQLite trigram FTS5 index over transactions.description (see database.ensure_search_index)
+transactions_fts = table("transactions_fts", column("transactions_fts"), column("rowid"), column("rank"))
+
 
 def parse_enum_param(value: Optional[str]) -> Optional[str]:
     """Convert empty string to None for enum parameters"""
@@ -26,8 +59,79 @@ def parse_enum_param(value: Optional[str]) -> Optional[str]:
     return value
 
 
-@router.get("", response_model=TransactionList)
+def encode_cursor(transaction: Transaction) -> str:
+    """Build an opaque keyset cursor from the last row of a page"""
+    payload = [transaction.date.isoformat(), transaction.created_at.isoformat(), str(transaction.id)]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, datetime, uuid.UUID]:
+    """Decode a keyset cursor back into its (date, created_at, id) position"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_date, raw_created_at, raw_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return date.fromisoformat(raw_date), datetime.fromisoformat(raw_created_at), uuid.UUID(raw_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def apply_description_search(query, search: str, dialect: str, by_relevance: bool):
+    """
+    Filter by description substring through the search index
+    PostgreSQL: ILIKE served by the pg_trgm GIN index, ranked by word_similarity
+    SQLite: trigram FTS5 MATCH ranked by bm25 (terms under 3 characters fall back to ILIKE)
+    """
+    if dialect == "sqlite" and database.sqlite_fts_enabled and len(search) >= 3:
+        phrase = '"' + search.replace('"', '""') + '"'
+        query = query.join(
+            transactions_fts, transactions_fts.c.rowid == literal_column("transactions.rowid")
+        ).where(transactions_fts.c.transactions_fts.op("MATCH")(phrase))
+        return query.order_by(transactions_fts.c.rank) if by_relevance else query
+    
+    query = query.where(Transaction.description.ilike(f"%{search}%"))
+    if by_relevance and dialect == "postgresql":
+        query = query.order_by(desc(func.word_similarity(search, Transaction.description)))
+    return query
+
+
+async def count_with_estimate(db: AsyncSession, query) -> Tuple[int, bool]:
+    """Exact count for small result sets, planner estimate (or lower bound) for large ones"""
+    capped = query.with_only_columns(Transaction.id).order_by(None).limit(EXACT_COUNT_LIMIT + 1).subquery()
+    total = await db.scalar(select(func.count()).select_from(capped))
+    if total <= EXACT_COUNT_LIMIT:
+        return total, False
+    
+    estimate = await estimate_row_count(db, query)
+    return max(total, estimate or 0), True
+
+
+def signed_amount(transaction_type: TransactionType, amount: Decimal) -> Decimal:
+    """Effect of one transaction on the balance: income adds, expense subtracts"""
+    return amount if transaction_type == TransactionType.INCOME else -amount
+
+
+async def adjust_user_totals(db: AsyncSession, user_id: uuid.UUID, amount_delta: Decimal, count_delta: int = 0) -> None:
+    """
+    Apply a balance/transaction count change as one UPDATE ... SET x = x + :delta
+    The database does the arithmetic, so concurrent writers for the same user never lose an update
+    Also bumps data_version, which invalidates the user's cached analytics
+    """
+    values = {"data_version": User.data_version + 1}
+    if amount_delta:
+        values["current_amount"] = User.current_amount + amount_delta
+    if count_delta:
+        values["transaction_count"] = User.transaction_count + count_delta
+    await db.execute(
+        update(User).where(User.id == user_id).values(**values).execution_options(synchronize_session=False)
+    )
+
+
+@router.get("", response_model=TransactionList, dependencies=[Depends(conditional_get)])
 async def get_transactions(
+    response: Response,
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(10, ge=1, le=100, description="Items per page"),
     transaction_type: Optional[str] = Query(None, description="Filter by transaction type"),
@@ -35,10 +139,20 @@ async def get_transactions(
     start_date: Optional[date] = Query(None, description="Start date filter"),
     end_date: Optional[date] = Query(None, description="End date filter"),
     search: Optional[str] = Query(None, description="Search in description"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous next_cursor (replaces page)"),
+    include_total: bool = Query(True, description="Return total/total_pages; disable for infinite scroll"),
+    exact_total: bool = Query(False, description="Always run an exact COUNT for filtered lists"),
+    sort: str = Query("date", pattern="^(date|relevance)$", description="Order by date, or by search relevance"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get paginated list of user transactions with filters"""
+    """
+    Get paginated list of user transactions with filters
+    Pass next_cursor back as cursor to seek straight to the following page instead of using OFFSET
+    Unfiltered totals come from the user's maintained counter; filtered totals are exact up to
+    EXACT_COUNT_LIMIT rows and estimated beyond that (total_is_estimate=true)
+    sort=relevance ranks search matches best-first and uses page-based pagination
+    """
     # Parse enum parameters
     transaction_type_enum = None
     category_enum = None
@@ -62,58 +176,93 @@ async def get_transactions(
             )
     
     # Build query
-    query = db.query(Transaction).filter(Transaction.user_id == current_user.id)
+    query = select(Transaction).where(Transaction.user_id == current_user.id)
     
     # Apply filters
     if transaction_type_enum:
-        query = query.filter(Transaction.type == transaction_type_enum)
+        query = query.where(Transaction.type == transaction_type_enum)
     
     if category_enum:
-        query = query.filter(Transaction.category == category_enum)
+        query = query.where(Transaction.category == category_enum)
     
     if start_date:
-        query = query.filter(Transaction.date >= start_date)
+        query = query.where(Transaction.date >= start_date)
     
     if end_date:
-        query = query.filter(Transaction.date <= end_date)
+        query = query.where(Transaction.date <= end_date)
+    
+    by_relevance = bool(search) and sort == "relevance"
+    if by_relevance and cursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination is not available with sort=relevance"
+        )
     
     if search:
-        query = query.filter(Transaction.description.ilike(f"%{search}%"))
+        query = apply_description_search(query, search, db.get_bind().dialect.name, by_relevance)
     
     # Get total count
-    total = query.count()
+    total = None
+    total_is_estimate = False
+    is_filtered = any([transaction_type_enum, category_enum, start_date, end_date, search])
+    if include_total:
+        if not is_filtered:
+            total = current_user.transaction_count
+        elif exact_total:
+            total = await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+        else:
+            total, total_is_estimate = await count_with_estimate(db, query)
+    
+    # Apply pagination: seek past the cursor when given, otherwise fall back to OFFSET
+    page_query = query.order_by(desc(Transaction.date), desc(Transaction.created_at), desc(Transaction.id))
+    if cursor:
+        page_query = page_query.where(
+            tuple_(Transaction.date, Transaction.created_at, Transaction.id) < tuple_(*decode_cursor(cursor))
+        )
+    else:
+        page_query = page_query.offset((page - 1) * per_page)
     
-    # Apply pagination
-    offset = (page - 1) * per_page
-    transactions = query.order_by(desc(Transaction.date), desc(Transaction.created_at)).offset(offset).limit(per_page).all()
+    # Fetch one extra row to learn whether another page follows
+    result = await db.execute(page_query.limit(per_page + 1))
+    transactions = result.scalars().all()
+    has_more = len(transactions) > per_page and not by_relevance
+    transactions = transactions[:per_page]
     
     # Calculate total pages
-    total_pages = math.ceil(total / per_page)
+    total_pages = math.ceil(total / per_page) if total is not None else None
     
-    return TransactionList(
+    # Already validated from the ORM rows: dump straight to JSON rather than letting
+    # FastAPI re-validate the model and json.dumps an intermediate dict
+    return json_response(TransactionList(
         transactions=transactions,
         total=total,
+        total_is_estimate=total_is_estimate,
         page=page,
         per_page=per_page,
-        total_pages=total_pages
-    )
+        total_pages=total_pages,
+        next_cursor=encode_cursor(transactions[-1]) if has_more else None
+    ), response)
 
 
 @router.post("", response_model=TransactionResponse)
 async def create_transaction(
     transaction: TransactionCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new transaction"""
     try:
         # Auto-categorize if it's an expense and no category provided
         transaction_data = transaction.dict()
-        if (transaction.type == TransactionType.EXPENSE and 
-            not transaction_data.get('category') and 
+        if transaction.type == TransactionType.EXPENSE and transaction_data.get('category'):
+            transaction_data['category_source'] = CategorySource.USER.value
+        elif (transaction.type == TransactionType.EXPENSE and 
             transaction_data.get('description')):
-            suggested_category = AIService.categorize_transaction(transaction_data['description'])
+            suggested_category, source = await AIService.categorize_transaction_with_source(
+                db, transaction_data['description']
+            )
             transaction_data['category'] = suggested_category
+            transaction_data['category_source'] = source.value
         
         # Create new transaction
         db_transaction = Transaction(
@@ -121,36 +270,67 @@ async def create_transaction(
             **transaction_data
         )
         
-        # Update user's current amount
-        if transaction.type == TransactionType.INCOME:
-            current_user.current_amount += transaction.amount
-        else:  # EXPENSE
-            current_user.current_amount -= transaction.amount
-        
         db.add(db_transaction)
-        db.commit()
-        db.refresh(db_transaction)
         
-        return db_transaction
+        # Update user's current amount in the same transaction
+        await adjust_user_totals(db, current_user.id, signed_amount(transaction.type, transaction.amount), 1)
+        await AnalyticsRollup.apply(db, AnalyticsRollup.add_delta(
+            {}, current_user.id, db_transaction.date, db_transaction.type, db_transaction.category, db_transaction.amount
+        ))
+        await db.commit()
+        await db.refresh(db_transaction)
         
+        return db_transaction
+    
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create transaction: {str(e)}"
         )
 
 
-@router.get("/{transaction_id}", response_model=TransactionResponse)
+@router.get("/export")
+async def export_transactions(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson|parquet)$", description="csv, ndjson or parquet"),
+    start_date: Optional[date] = Query(None, description="Start date filter"),
+    end_date: Optional[date] = Query(None, description="End date filter"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Download the user's transactions, oldest first
+    Rows are streamed from a server-side cursor EXPORT_BATCH_SIZE at a time and encoded as they
+    arrive, so the response starts immediately and memory stays bounded for any history size
+    """
+    query = select(*EXPORT_COLUMNS).where(Transaction.user_id == current_user.id)
+    if start_date:
+        query = query.where(Transaction.date >= start_date)
+    if end_date:
+        query = query.where(Transaction.date <= end_date)
+    query = query.order_by(Transaction.date, Transaction.created_at, Transaction.id)
+    
+    result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    return StreamingResponse(
+        TransactionExporter.stream(result.partitions(), export_format),
+        media_type=TransactionExporter.MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{export_format}"'}
+    )
+
+
+@router.get("/{transaction_id}", response_model=TransactionResponse, dependencies=[Depends(conditional_get)])
 async def get_transaction(
     transaction_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get a specific transaction by ID"""
-    transaction = db.query(Transaction).filter(
-        and_(Transaction.id == transaction_id, Transaction.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(Transaction).where(
+            and_(Transaction.id == transaction_id, Transaction.user_id == current_user.id)
+        )
+    )
+    transaction = result.scalars().first()
     
     if not transaction:
         raise HTTPException(
@@ -166,13 +346,16 @@ async def update_transaction(
     transaction_id: uuid.UUID,
     transaction_update: TransactionUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a specific transaction"""
     # Get existing transaction
-    db_transaction = db.query(Transaction).filter(
-        and_(Transaction.id == transaction_id, Transaction.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(Transaction).where(
+            and_(Transaction.id == transaction_id, Transaction.user_id == current_user.id)
+        )
+    )
+    db_transaction = result.scalars().first()
     
     if not db_transaction:
         raise HTTPException(
@@ -181,35 +364,36 @@ async def update_transaction(
         )
     
     try:
-        # Store old values for amount adjustment
-        old_amount = db_transaction.amount
-        old_type = db_transaction.type
+        # Store old effect for amount adjustment, and take it out of the daily rollup
+        old_effect = signed_amount(db_transaction.type, db_transaction.amount)
+        rollup_deltas = AnalyticsRollup.add_delta(
+            {}, current_user.id, db_transaction.date, db_transaction.type, db_transaction.category,
+            -db_transaction.amount, -1
+        )
         
         # Update transaction fields
         update_data = transaction_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_transaction, field, value)
+        if "category" in update_data:
+            db_transaction.category_source = CategorySource.USER.value if db_transaction.category else None
         
-        # Adjust user's current amount
-        # Revert old transaction effect
-        if old_type == TransactionType.INCOME:
-            current_user.current_amount -= old_amount
-        else:
-            current_user.current_amount += old_amount
-        
-        # Apply new transaction effect
-        if db_transaction.type == TransactionType.INCOME:
-            current_user.current_amount += db_transaction.amount
-        else:
-            current_user.current_amount -= db_transaction.amount
+        # Adjust user's current amount: revert the old effect and apply the new one
+        new_effect = signed_amount(db_transaction.type, db_transaction.amount)
+        await adjust_user_totals(db, current_user.id, new_effect - old_effect)
+        AnalyticsRollup.add_delta(
+            rollup_deltas, current_user.id, db_transaction.date, db_transaction.type, db_transaction.category,
+            db_transaction.amount
+        )
+        await AnalyticsRollup.apply(db, rollup_deltas)
         
-        db.commit()
-        db.refresh(db_transaction)
+        await db.commit()
+        await db.refresh(db_transaction)
         
         return db_transaction
-        
+    
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update transaction: {str(e)}"
@@ -220,12 +404,15 @@ async def update_transaction(
 async def delete_transaction(
     transaction_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a specific transaction"""
-    transaction = db.query(Transaction).filter(
-        and_(Transaction.id == transaction_id, Transaction.user_id == current_user.id)
-    ).first()
+    result = await db.execute(
+        select(Transaction).where(
+            and_(Transaction.id == transaction_id, Transaction.user_id == current_user.id)
+        )
+    )
+    transaction = result.scalars().first()
     
     if not transaction:
         raise HTTPException(
@@ -235,29 +422,125 @@ async def delete_transaction(
     
     try:
         # Revert transaction effect on user's current amount
-        if transaction.type == TransactionType.INCOME:
-            current_user.current_amount -= transaction.amount
-        else:
-            current_user.current_amount += transaction.amount
+        await adjust_user_totals(db, current_user.id, -signed_amount(transaction.type, transaction.amount), -1)
+        await AnalyticsRollup.apply(db, AnalyticsRollup.add_delta(
+            {}, current_user.id, transaction.date, transaction.type, transaction.category, -transaction.amount, -1
+        ))
         
-        db.delete(transaction)
-        db.commit()
+        await db.delete(transaction)
+        await db.commit()
         
         return {"message": "Transaction deleted successfully"}
-        
+    
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete transaction: {str(e)}"
         )
 
 
+def build_transaction_row(
+    user_id: uuid.UUID, item: OCRTransactionItem, category_source: Optional[CategorySource] = None
+) -> Dict[str, Any]:
+    """
+    Validate one imported item and turn it into an insertable row (raises ValueError)
+    The category counts as the user's unless category_source says otherwise
+    """
+    if item.amount > MAX_AMOUNT:
+        raise ValueError(f"amount {item.amount} exceeds {MAX_AMOUNT}")
+    if item.description and len(item.description) > 500:
+        raise ValueError("description longer than 500 characters")
+    
+    is_expense = item.type == TransactionType.EXPENSE
+    if is_expense and not item.category:
+        category_source = CategorySource.DEFAULT
+    return {
+        "user_id": user_id,
+        "amount": item.amount,
+        "type": item.type,
+        "category": item.category or ExpenseCategory.MISCELLANEOUS if is_expense else None,
+        "category_source": (category_source or CategorySource.USER).value if is_expense else None,
+        "description": item.description,
+        "date": item.date
+    }
+
+
+def balance_delta(rows: List[Dict[str, Any]]) -> Decimal:
+    """Net effect of a batch of rows on the user's current amount"""
+    return sum((signed_amount(row["type"], row["amount"]) for row in rows), Decimal(0))
+
+
+async def insert_transaction_rows(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[uuid.UUID]:
+    """Insert rows in one multi-row INSERT ... RETURNING id, in input order"""
+    if not rows:
+        return []
+    result = await db.execute(
+        insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+        rows
+    )
+    return list(result.scalars().all())
+
+
+async def copy_transaction_rows(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """Stream rows into the table with COPY on PostgreSQL, executemany INSERT elsewhere"""
+    if not rows:
+        return
+    if db.get_bind().dialect.name != "postgresql":
+        await db.execute(insert(Transaction), rows)
+        return
+    
+    connection = await db.connection(bind_arguments={"clause": insert(Transaction)})
+    # COPY goes straight to asyncpg, so make sure the session's transaction is open on it first
+    await connection.execute(text("SELECT 1"))
+    raw_connection = await connection.get_raw_connection()
+    
+    now = datetime.utcnow()
+    records = [
+        (
+            uuid.uuid4(), row["user_id"], row["amount"], row["type"].name,
+            row["category"].name if row["category"] else None,
+            row["description"], row["date"], now, now
+        )
+        for row in rows
+    ]
+    await raw_connection.driver_connection.copy_records_to_table(
+        Transaction.__tablename__,
+        records=records,
+        columns=["id", "user_id", "amount", "type", "category", "description", "date", "created_at", "updated_at"]
+    )
+
+
+def prepare_import_batch(
+    entries: Iterator[ParsedEntry], user_id: uuid.UUID, size: int
+) -> Tuple[List[Dict[str, Any]], List[str], bool]:
+    """Parse, categorize and validate the next batch of statement entries (runs off the event loop)"""
+    rows = []
+    errors = []
+    exhausted = True
+    for line_number, item, error in entries:
+        if item is not None:
+            source = None
+            if item.type == TransactionType.EXPENSE and not item.category:
+                item.category = AIService._fallback_categorize_transaction(item.description)
+                source = CategorySource.KEYWORDS
+            try:
+                rows.append(build_transaction_row(user_id, item, source))
+            except ValueError as e:
+                error = str(e)
+        if error:
+            errors.append(f"Line {line_number}: {error}")
+        if len(rows) + len(errors) >= size:
+            exhausted = False
+            break
+    return rows, errors, exhausted
+
+
 @router.post("/bulk", response_model=BulkTransactionResponse)
 async def create_bulk_transactions(
     bulk_request: BulkTransactionCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create multiple transactions from OCR results or bulk import"""
     
@@ -266,39 +549,27 @@ async def create_bulk_transactions(
     errors = []
     
     try:
+        # Validate every item up front so the insert itself can be set-based
+        rows = []
         for ocr_transaction in bulk_request.transactions:
             try:
-                # Create transaction model
-                transaction = Transaction(
-                    user_id=current_user.id,
-                    amount=ocr_transaction.amount,
-                    type=ocr_transaction.type,  # Use the type from the request
-                    category=ocr_transaction.category or ExpenseCategory.MISCELLANEOUS if ocr_transaction.type == TransactionType.EXPENSE else None,
-                    description=ocr_transaction.description,
-                    date=ocr_transaction.date
-                )
-                
-                # Update user's current amount
-                if transaction.type == TransactionType.INCOME:
-                    current_user.current_amount += transaction.amount
-                else:  # EXPENSE
-                    current_user.current_amount -= transaction.amount
-                
-                db.add(transaction)
-                db.flush()  # Get ID without committing
-                created_transactions.append(str(transaction.id))
-                
-            except Exception as e:
+                rows.append(build_transaction_row(current_user.id, ocr_transaction))
+            except ValueError as e:
                 failed_transactions.append(ocr_transaction.description)
                 errors.append(f"Failed to create transaction '{ocr_transaction.description}': {str(e)}")
                 logger.warning(f"Failed to create transaction for user {current_user.id}: {e}")
-                
+        
+        # One INSERT round-trip for all valid rows and one aggregated balance update
+        created_transactions = [str(transaction_id) for transaction_id in await insert_transaction_rows(db, rows)]
+        
         # Commit all successful transactions
         if created_transactions:
-            db.commit()
+            await adjust_user_totals(db, current_user.id, balance_delta(rows), len(created_transactions))
+            await AnalyticsRollup.apply(db, AnalyticsRollup.deltas_for_rows(current_user.id, rows))
+            await db.commit()
             logger.info(f"Created {len(created_transactions)} transactions for user {current_user.id}")
         else:
-            db.rollback()
+            await db.rollback()
         
         return BulkTransactionResponse(
             created_count=len(created_transactions),
@@ -306,9 +577,9 @@ async def create_bulk_transactions(
             transaction_ids=created_transactions,
             errors=errors
         )
-        
+    
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Bulk transaction creation failed for user {current_user.id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -316,15 +587,81 @@ async def create_bulk_transactions(
         )
 
 
+@router.post("/import", response_model=TransactionImportResponse)
+async def import_statement(
+    file: UploadFile = File(..., description="Bank statement export (CSV, OFX or QFX)"),
+    statement_format: Optional[str] = Query(None, pattern="^(csv|ofx|qfx)$", description="Defaults to the file extension"),
+    date_format: Optional[str] = Query(None, description="strptime format for CSV dates, e.g. %d/%m/%Y (required when MM/DD vs DD/MM is ambiguous)"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Import a bank statement of any size
+    The upload is parsed incrementally and written IMPORT_CHUNK_SIZE rows at a time (COPY on
+    PostgreSQL), so memory stays flat; the whole import commits or rolls back as one transaction
+    """
+    statement_format = statement_format or StatementParser.detect_format(file.filename, file.content_type)
+    entries = StatementParser.parse(file.file, statement_format, date_format)
+    
+    created_count = 0
+    failed_count = 0
+    errors = []
+    delta = Decimal(0)
+    
+    try:
+        exhausted = False
+        while not exhausted:
+            rows, batch_errors, exhausted = await run_in_threadpool(
+                prepare_import_batch, entries, current_user.id, IMPORT_CHUNK_SIZE
+            )
+            await copy_transaction_rows(db, rows)
+            await AnalyticsRollup.apply(db, AnalyticsRollup.deltas_for_rows(current_user.id, rows))
+            created_count += len(rows)
+            delta += balance_delta(rows)
+            failed_count += len(batch_errors)
+            errors.extend(batch_errors[:MAX_IMPORT_ERRORS - len(errors)])
+        
+        if created_count:
+            await adjust_user_totals(db, current_user.id, delta, created_count)
+            await db.commit()
+            logger.info(f"Imported {created_count} transactions for user {current_user.id}")
+        else:
+            await db.rollback()
+    
+    except ValueError as e:
+        # Unreadable statement (e.g. no recognisable header)
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid statement: {str(e)}"
+        )
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Statement import failed for user {current_user.id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import statement: {str(e)}"
+        )
+    
+    return TransactionImportResponse(
+        format=statement_format,
+        created_count=created_count,
+        failed_count=failed_count,
+        errors=errors
+    )
+
+
 @router.post("/categorize")
 async def categorize_transaction_description(
     description: str = Query(..., description="Transaction description"),
     amount: Optional[float] = Query(None, description="Transaction amount for better categorization"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get AI-suggested category for a transaction description"""
+    """Get AI-suggested category for a transaction description (cached per normalized description)"""
     try:
-        suggested_category = AIService.categorize_transaction(description, amount)
+        suggested_category = await AIService.categorize_transaction_cached(db, description, amount)
+        await db.commit()
         return {
             "description": description,
             "suggested_category": suggested_category.value,
@@ -338,4 +675,33 @@ async def categorize_transaction_description(
         )
 
 
- 
\ No newline at end of file
+@router.post("/categorize/batch", response_model=BatchCategorizeResponse)
+async def categorize_transaction_descriptions(
+    request: BatchCategorizeRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get suggested categories for up to 500 descriptions (e.g. a statement before import)
+    Duplicates are resolved once; cached and locally predicted merchants skip Gemini and
+    the rest share a single Gemini call
+    """
+    try:
+        results, ai_calls = await AIService.categorize_transactions_cached(db, request.descriptions)
+        await db.commit()
+        return BatchCategorizeResponse(
+            results=[
+                CategorizedDescription(description=description, suggested_category=category, source=source)
+                for description, (category, source) in zip(request.descriptions, results)
+            ],
+            unique_count=len({CategoryCache.normalize(description) for description in request.descriptions}),
+            ai_calls=ai_calls
+        )
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to categorize transactions: {str(e)}"
+        )
+
+
@@ -15,6 +15,44 @@ class Settings(BaseSettings):
     )
     sql_echo: bool = Field(default=False, env="SQL_ECHO")
     
+    # Connection pool (PostgreSQL); size it per worker: workers * (pool + overflow) <= max_connections
+    db_pool_size: int = Field(default=20, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=0, env="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=30.0, env="DB_POOL_TIMEOUT")  # seconds to wait for a free connection
+    db_pool_recycle: int = Field(default=1800, env="DB_POOL_RECYCLE")  # seconds, -1 disables
+    db_pool_pre_ping: bool = Field(default=True, env="DB_POOL_PRE_PING")
+    
+    # Read replicas for read-only endpoints (comma-separated URLs, empty = primary only)
+    database_replica_urls: str = Field(default="", env="DATABASE_REPLICA_URLS")
+    
+    # SQLite production mode (WAL, single writer + pooled readers)
+    sqlite_production_mode: bool = Field(default=False, env="SQLITE_PRODUCTION_MODE")
+    sqlite_reader_pool_size: int = Field(default=8, env="SQLITE_READER_POOL_SIZE")
+    sqlite_busy_timeout_ms: int = Field(default=5000, env="SQLITE_BUSY_TIMEOUT_MS")
+    sqlite_cache_size_kb: int = Field(default=64 * 1024, env="SQLITE_CACHE_SIZE_KB")  # 64MB per connection
+    sqlite_mmap_size: int = Field(default=256 * 1024 * 1024, env="SQLITE_MMAP_SIZE")  # 256MB
+    
+    # Per-user analytics cache (entries per worker, 0 disables; seconds fresh, then served stale while refreshing)
+    analytics_cache_max_entries: int = Field(default=10000, env="ANALYTICS_CACHE_MAX_ENTRIES")
+    analytics_cache_ttl: float = Field(default=300.0, env="ANALYTICS_CACHE_TTL")
+    analytics_cache_stale_ttl: float = Field(default=3600.0, env="ANALYTICS_CACHE_STALE_TTL")
+    
+    # In-memory entries in front of the category_cache table (per worker, 0 = database only)
+    category_cache_max_entries: int = Field(default=50000, env="CATEGORY_CACHE_MAX_ENTRIES")
+    
+    # Concurrent categorization cache misses wait up to this long to share one Gemini prompt (0 disables)
+    categorization_batch_window_ms: float = Field(default=10.0, env="CATEGORIZATION_BATCH_WINDOW_MS")
+    categorization_batch_max_size: int = Field(default=50, env="CATEGORIZATION_BATCH_MAX_SIZE")
+    
+    # Local naive Bayes categorizer (trained by manage.py train-categorizer; answers at or above the
+    # confidence that reached the target accuracy on its holdout, never below the minimum)
+    local_categorizer_path: str = Field(default="category_model.npz", env="LOCAL_CATEGORIZER_PATH")
+    local_categorizer_target_accuracy: float = Field(default=0.97, env="LOCAL_CATEGORIZER_TARGET_ACCURACY")
+    local_categorizer_min_confidence: float = Field(default=0.5, env="LOCAL_CATEGORIZER_MIN_CONFIDENCE")
+    
+    # Responses at least this many bytes are brotli/gzip compressed (0 compresses everything)
+    compression_minimum_size: int = Field(default=1024, env="COMPRESSION_MINIMUM_SIZE")
+    
     # JWT
     secret_key: str = Field(
         default="your-secret-key-change-in-production",
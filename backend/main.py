@@ -5,8 +5,15 @@ from contextlib import asynccontextmanager
 import os
 from datetime import datetime
 
-from database import create_database, DatabaseManager
+from config import settings
+from database import create_database_async, DatabaseManager
 from api import auth_router, users_router, transactions_router, goals_router, analytics_router, ai_router
+from api.compression import CompressionMiddleware
+from api.responses import FastJSONResponse
+from services.analytics_cache import analytics_cache
+from services.category_cache import category_cache
+from services.local_categorizer import local_categorizer
+from services.ai_service import categorization_batcher
 
 
 @asynccontextmanager
@@ -16,13 +23,13 @@ async def lifespan(app: FastAPI):
     print("🚀 Starting SideMoney.ai Backend...")
     
     # Check database connection
-    if not DatabaseManager.check_connection():
+    if not await DatabaseManager.check_async_connection():
         print("❌ Database connection failed!")
         raise HTTPException(status_code=500, detail="Database connection failed")
     
     # Create tables if they don't exist
     try:
-        create_database()
+        await create_database_async()
         print("✅ Database initialized successfully")
     except Exception as e:
         print(f"❌ Database initialization failed: {e}")
@@ -34,6 +41,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("👋 Shutting down SideMoney.ai Backend...")
+    await DatabaseManager.dispose()
 
 
 # Create FastAPI application
@@ -43,6 +51,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
@@ -53,8 +62,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# Compress large responses (transaction lists, OCR text, exports) with brotli or gzip
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
+
 # Add trusted host middleware for production
 if os.getenv("ENVIRONMENT") == "production":
     app.add_middleware(
@@ -96,11 +109,25 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    db_healthy = DatabaseManager.check_connection()
+    db_healthy = await DatabaseManager.check_async_connection()
     
     return {
         "status": "healthy" if db_healthy else "unhealthy",
         "database": "connected" if db_healthy else "disconnected",
+        "database_pool": DatabaseManager.get_pool_stats(),
+        "timestamp": str(datetime.now())
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics for capacity planning"""
+    return {
+        "database_pool": DatabaseManager.get_pool_stats(),
+        "analytics_cache": analytics_cache.get_stats(),
+        "category_cache": category_cache.get_stats(),
+        "local_categorizer": local_categorizer.get_stats(),
+        "categorization_batcher": categorization_batcher.get_stats(),
         "timestamp": str(datetime.now())
     }
 
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+SideMoney.ai maintenance commands
+Run from the backend directory, e.g.: python manage.py reconcile-balances --dry-run
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+
+async def reconcile_balances(args):
+    """Check every user's stored balance against the ledger and repair drift"""
+    from database import AsyncSessionLocal, DatabaseManager
+    from services.balance_reconciler import BalanceReconciler
+
+    print("🔍 Reconciling balances" + (" (dry run)" if args.dry_run else "") + "...")
+    try:
+        report = await BalanceReconciler.reconcile_all(
+            AsyncSessionLocal, batch_size=args.batch_size, repair=not args.dry_run
+        )
+    finally:
+        await DatabaseManager.dispose()
+
+    print(f"📊 Checked {report['users_checked']} users, {report['users_drifted']} drifted (net {report['total_drift']})")
+    if report["users_drifted"] and args.dry_run:
+        print("⚠️ Drift found; run without --dry-run to repair")
+        return 1
+    print("✅ Balances reconciled")
+    return 0
+
+
+async def backfill_rollups(args):
+    """Rebuild the daily analytics rollup from the transactions table"""
+    from database import AsyncSessionLocal, DatabaseManager, create_database_async
+    from services.analytics_rollup import AnalyticsRollup
+
+    print("📊 Backfilling daily_user_category_totals...")
+    try:
+        await create_database_async()
+        processed = await AnalyticsRollup.backfill(AsyncSessionLocal, batch_size=args.batch_size)
+    finally:
+        await DatabaseManager.dispose()
+
+    print(f"✅ Rebuilt rollups for {processed} users")
+    return 0
+
+
+async def rebuild_search_index(args):
+    """Rebuild the description search index (SQLite: re-key the FTS table after a VACUUM)"""
+    from database import async_engine, DatabaseManager, ensure_search_index
+
+    print("🔎 Rebuilding the transaction search index...")
+    try:
+        async with async_engine.begin() as connection:
+            await connection.run_sync(ensure_search_index)
+    finally:
+        await DatabaseManager.dispose()
+
+    print("✅ Search index rebuilt")
+    return 0
+
+
+async def train_categorizer(args):
+    """Train the local categorizer on the categories stored in transactions"""
+    from config import settings
+    from database import AsyncSessionLocal, DatabaseManager
+    from services.local_categorizer import LocalCategorizer
+
+    output = args.output or settings.local_categorizer_path
+    print(f"🧠 Training local categorizer -> {output}...")
+    started = time.perf_counter()
+    try:
+        report = await LocalCategorizer.train_from_database(
+            AsyncSessionLocal, output,
+            min_confidence=settings.local_categorizer_min_confidence,
+            target_accuracy=settings.local_categorizer_target_accuracy
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        await DatabaseManager.dispose()
+
+    print(f"📊 {report['transactions']} transactions, {report['descriptions']} distinct descriptions")
+    if report["min_confidence"] == float("inf"):
+        print(f"⚠️ No confidence reached {settings.local_categorizer_target_accuracy:.0%} accuracy on the holdout; "
+              "the model will not answer until retrained on more data")
+    else:
+        print(
+            f"📊 Holdout: answers {report['holdout_coverage']:.1%} of {report['holdout_transactions']} transactions "
+            f"at >= {report['min_confidence']:.6f} confidence, {report['holdout_accuracy']:.1%} correct"
+        )
+    print(f"✅ Trained in {time.perf_counter() - started:.1f}s; workers reload it within a minute")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SideMoney.ai maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reconcile = commands.add_parser("reconcile-balances", help="Detect and repair balance drift for all users")
+    reconcile.add_argument("--dry-run", action="store_true", help="Report drift without repairing it")
+    reconcile.add_argument("--batch-size", type=int, default=500, help="Users checked per query")
+    reconcile.set_defaults(handler=reconcile_balances)
+
+    backfill = commands.add_parser("backfill-rollups", help="Rebuild the daily analytics rollup from transactions")
+    backfill.add_argument("--batch-size", type=int, default=500, help="Users rebuilt per transaction")
+    backfill.set_defaults(handler=backfill_rollups)
+
+    search = commands.add_parser("rebuild-search-index", help="Rebuild the description search index")
+    search.set_defaults(handler=rebuild_search_index)
+
+    train = commands.add_parser("train-categorizer", help="Train the local categorizer from stored categories")
+    train.add_argument("--output", help="Model file (default: LOCAL_CATEGORIZER_PATH)")
+    train.set_defaults(handler=train_categorizer)
+
+    args = parser.parse_args()
+    sys.exit(asyncio.run(args.handler(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,5 +2,7 @@ from .base import Base
 from .user import User
 from .transaction import Transaction
 from .goal import Goal
+from .daily_total import DailyUserCategoryTotal
+from .category_cache import CategoryCacheEntry
 
-__all__ = ["Base", "User", "Transaction", "Goal"] 
\ No newline at end of file
+__all__ = ["Base", "User", "Transaction", "Goal", "DailyUserCategoryTotal", "CategoryCacheEntry"] 
\ No newline at end of file
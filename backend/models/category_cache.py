@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, DateTime, Enum as SQLEnum
+from datetime import datetime
+from .base import Base
+from .transaction import ExpenseCategory
+
+
+class CategoryCacheEntry(Base):
+    """Category the AI assigned to a normalized transaction description, shared by all users"""
+    __tablename__ = "category_cache"
+    
+    key = Column(String(255), primary_key=True)
+    category = Column(SQLEnum(ExpenseCategory), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<CategoryCacheEntry(key={self.key}, category={self.category})>"
\ No newline at end of file
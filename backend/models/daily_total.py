@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, Numeric, Integer, Date, ForeignKey, Enum as SQLEnum
+from sqlalchemy.orm import relationship
+from sqlalchemy import Uuid
+from .base import Base
+from .transaction import TransactionType
+
+
+class DailyUserCategoryTotal(Base):
+    """Per-day rollup of a user's transactions, maintained on every transaction write"""
+    __tablename__ = "daily_user_category_totals"
+    
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    type = Column(SQLEnum(TransactionType), primary_key=True)
+    # ExpenseCategory value, or "" for uncategorized rows (keeps the key NOT NULL so upserts match)
+    category = Column(String(32), primary_key=True, default="")
+    total = Column(Numeric(14, 2), nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+    
+    # Relationships
+    user = relationship("User", back_populates="daily_totals")
+    
+    def __repr__(self):
+        return f"<DailyUserCategoryTotal(user_id={self.user_id}, date={self.date}, type={self.type}, category={self.category})>"
\ No newline at end of file
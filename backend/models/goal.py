@@ -1,6 +1,6 @@
 from sqlalchemy import Column, String, Numeric, Date, ForeignKey
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Uuid
 from .base import BaseModel
 
 
@@ -8,7 +8,7 @@ class Goal(BaseModel):
     """Goal model for financial goal tracking"""
     __tablename__ = "goals"
     
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     title = Column(String(255), nullable=False)
     target_amount = Column(Numeric(12, 2), nullable=False)
     deadline = Column(Date, nullable=False, index=True)
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Numeric, Date, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Numeric, Date, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Uuid
 from enum import Enum
 from .base import BaseModel
 
@@ -29,14 +29,28 @@ class ExpenseCategory(str, Enum):
     MISCELLANEOUS = "MISCELLANEOUS"
 
 
+class CategorySource(str, Enum):
+    """Where a transaction's category came from"""
+    USER = "user"          # Chosen by the user (or named in their statement file)
+    AI = "ai"              # Gemini, directly or from the category cache
+    LOCAL = "local"        # Local categorizer
+    KEYWORDS = "keywords"  # Keyword fallback
+    DEFAULT = "default"    # MISCELLANEOUS because nothing was given
+
+
 class Transaction(BaseModel):
     """Transaction model for income and expense tracking"""
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Serves the (date, created_at, id) keyset used by cursor pagination
+        Index("ix_transactions_user_date_created_id", "user_id", "date", "created_at", "id"),
+    )
     
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     amount = Column(Numeric(12, 2), nullable=False)
     type = Column(SQLEnum(TransactionType), nullable=False)
     category = Column(SQLEnum(ExpenseCategory), nullable=True)  # Only for expenses
+    category_source = Column(String(16), nullable=True)  # CategorySource value; NULL for older rows
     description = Column(String(500), nullable=True)
     date = Column(Date, nullable=False, index=True)
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Numeric, ARRAY, Text
+from sqlalchemy import Column, String, Numeric, Integer, ARRAY, JSON, Text
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
@@ -11,13 +11,16 @@ class User(BaseModel):
     name = Column(String(255), nullable=False)
     avatar_url = Column(Text, nullable=True)
     monthly_income = Column(Numeric(12, 2), nullable=True, default=0)
-    preferred_spending_days = Column(ARRAY(String), nullable=True, default=list)
+    preferred_spending_days = Column(ARRAY(String).with_variant(JSON(), "sqlite"), nullable=True, default=list)
     daily_budget_multiplier = Column(Numeric(5, 2), nullable=True, default=1.0)
     current_amount = Column(Numeric(12, 2), nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0, server_default="0")  # Maintained on every write
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped by every data write (cache key)
     
     # Relationships
     transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan")
     goals = relationship("Goal", back_populates="user", cascade="all, delete-orphan")
+    daily_totals = relationship("DailyUserCategoryTotal", back_populates="user", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email}, name={self.name})>" 
\ No newline at end of file
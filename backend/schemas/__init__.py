@@ -1,19 +1,21 @@
 from .user import UserCreate, UserUpdate, UserResponse, UserProfile
-from .transaction import TransactionCreate, TransactionUpdate, TransactionResponse, TransactionList
+from .transaction import TransactionCreate, TransactionUpdate, TransactionResponse, TransactionList, TransactionImportResponse
 from .goal import GoalCreate, GoalUpdate, GoalResponse, GoalList
 from .auth import Token, TokenData, GoogleAuthRequest
 from .ai import (
     FinancialRecommendation, SpendingInsight, AIAnalysisResponse,
     OCRResult, OCRTransactionItem, BulkTransactionCreate, BulkTransactionResponse,
-    AIPromptRequest, AIPromptResponse, RecommendationType, RecommendationPriority
+    AIPromptRequest, AIPromptResponse, RecommendationType, RecommendationPriority,
+    BatchCategorizeRequest, CategorizedDescription, BatchCategorizeResponse
 )
 
 __all__ = [
     "UserCreate", "UserUpdate", "UserResponse", "UserProfile",
-    "TransactionCreate", "TransactionUpdate", "TransactionResponse", "TransactionList",
+    "TransactionCreate", "TransactionUpdate", "TransactionResponse", "TransactionList", "TransactionImportResponse",
     "GoalCreate", "GoalUpdate", "GoalResponse", "GoalList",
     "Token", "TokenData", "GoogleAuthRequest",
     "FinancialRecommendation", "SpendingInsight", "AIAnalysisResponse",
     "OCRResult", "OCRTransactionItem", "BulkTransactionCreate", "BulkTransactionResponse",
-    "AIPromptRequest", "AIPromptResponse", "RecommendationType", "RecommendationPriority"
+    "AIPromptRequest", "AIPromptResponse", "RecommendationType", "RecommendationPriority",
+    "BatchCategorizeRequest", "CategorizedDescription", "BatchCategorizeResponse"
 ] 
\ No newline at end of file
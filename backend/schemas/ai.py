@@ -3,7 +3,7 @@ from typing import List, Optional, Dict, Any
 from decimal import Decimal
 from datetime import date as Date
 from enum import Enum
-from models.transaction import TransactionType, ExpenseCategory
+from models.transaction import TransactionType, ExpenseCategory, CategorySource
 
 
 class RecommendationType(str, Enum):
@@ -109,6 +109,25 @@ class BulkTransactionResponse(BaseModel):
     errors: List[str] = Field(default_factory=list, description="Error messages for failed transactions")
 
 
+class BatchCategorizeRequest(BaseModel):
+    """Request for categorizing many transaction descriptions at once"""
+    descriptions: List[str] = Field(..., min_length=1, max_length=500, description="Transaction descriptions")
+
+
+class CategorizedDescription(BaseModel):
+    """Suggested category for one description"""
+    description: str
+    suggested_category: ExpenseCategory
+    source: CategorySource = Field(..., description="Where the answer came from (cache hits count as ai)")
+
+
+class BatchCategorizeResponse(BaseModel):
+    """Response for batch categorization, in request order"""
+    results: List[CategorizedDescription]
+    unique_count: int = Field(..., description="Distinct descriptions after normalization")
+    ai_calls: int = Field(..., description="Gemini calls made (at most one per batch)")
+
+
 class AIPromptRequest(BaseModel):
     """Request for custom AI analysis"""
     user_query: str = Field(..., description="User's question or request")
@@ -77,10 +77,20 @@ class TransactionResponse(TransactionBase):
 class TransactionList(BaseModel):
     """Schema for paginated transaction list"""
     transactions: List[TransactionResponse]
-    total: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
     page: int
     per_page: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+
+class TransactionImportResponse(BaseModel):
+    """Response for a streamed bank statement import"""
+    format: str = Field(..., description="Statement format that was parsed (csv, ofx, qfx)")
+    created_count: int = Field(..., description="Number of transactions created")
+    failed_count: int = Field(default=0, description="Number of rows that could not be imported")
+    errors: List[str] = Field(default_factory=list, description="First import errors, by line")
@@ -1,4 +1,12 @@
-from .ai_service import AIService
+from .ai_service import AIService, categorization_batcher
 from .budget_calculator import BudgetCalculator
+from .statement_parser import StatementParser
+from .transaction_export import TransactionExporter
+from .balance_reconciler import BalanceReconciler
+from .analytics_rollup import AnalyticsRollup
+from .analytics_cache import AnalyticsCache, analytics_cache
+from .category_cache import CategoryCache, category_cache
+from .local_categorizer import LocalCategorizer, local_categorizer
+from .categorization_batcher import CategorizationBatcher
 
-__all__ = ["AIService", "BudgetCalculator"] 
\ No newline at end of file
+__all__ = ["AIService", "BudgetCalculator", "StatementParser", "TransactionExporter", "BalanceReconciler", "AnalyticsRollup", "AnalyticsCache", "analytics_cache", "CategoryCache", "category_cache", "LocalCategorizer", "local_categorizer", "CategorizationBatcher", "categorization_batcher"] 
\ No newline at end of file
@@ -1,6 +1,7 @@
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Tuple, Union
 import re
 import json
+import threading
 import base64
 from decimal import Decimal
 from datetime import date, datetime, timedelta
@@ -11,9 +12,16 @@ import io
 import PyPDF2
 from pdf2image import convert_from_bytes
 
-from models.transaction import ExpenseCategory, TransactionType
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.transaction import ExpenseCategory, TransactionType, CategorySource
 from models.goal import Goal
 from config import settings
+from services.category_cache import category_cache
+from services.keyword_matcher import KeywordMatcher
+from services.local_categorizer import local_categorizer
+from services.categorization_batcher import CategorizationBatcher
 from schemas.ai import (
     FinancialRecommendation, SpendingInsight, AIAnalysisResponse,
     OCRResult, OCRTransactionItem, RecommendationType, RecommendationPriority,
@@ -31,31 +39,36 @@ class AIService:
     """Enhanced AI service using Gemini LLM for financial analysis and OCR"""
     
     # Simple rate limiting - track daily API calls
+    # (Gemini calls run on threadpool threads, so the counter is only touched under the lock)
     _daily_api_calls = 0
     _last_reset_date = date.today()
     _max_daily_calls = 40  # Stay under the 50 limit
+    _api_calls_lock = threading.Lock()
     
     @classmethod
-    def _can_make_api_call(cls) -> bool:
-        """Check if we can make another API call today"""
-        today = date.today()
-        
-        # Reset counter if it's a new day
-        if today > cls._last_reset_date:
-            cls._daily_api_calls = 0
-            cls._last_reset_date = today
-        
-        # Check if we're under the limit
-        if cls._daily_api_calls >= cls._max_daily_calls:
-            logger.warning(f"Daily Gemini API limit reached ({cls._max_daily_calls}), using fallback methods")
-            return False
-        
-        return True
+    def _reserve_api_call(cls) -> bool:
+        """Take one of today's API calls if any are left (check and count in one step)"""
+        with cls._api_calls_lock:
+            today = date.today()
+            
+            # Reset counter if it's a new day
+            if today > cls._last_reset_date:
+                cls._daily_api_calls = 0
+                cls._last_reset_date = today
+            
+            # Check if we're under the limit
+            if cls._daily_api_calls >= cls._max_daily_calls:
+                logger.warning(f"Daily Gemini API limit reached ({cls._max_daily_calls}), using fallback methods")
+                return False
+            
+            cls._daily_api_calls += 1
+            return True
     
     @classmethod
-    def _record_api_call(cls):
-        """Record that we made an API call"""
-        cls._daily_api_calls += 1
+    def _release_api_call(cls):
+        """Give back a reserved call that was never completed"""
+        with cls._api_calls_lock:
+            cls._daily_api_calls = max(0, cls._daily_api_calls - 1)
     
     # Keywords mapping for fallback categorization
     CATEGORY_KEYWORDS = {
@@ -112,6 +125,9 @@ class AIService:
             'meeting', 'supplies', 'equipment'
         ]
     }
+    
+    # CATEGORY_KEYWORDS compiled into one regex on first use
+    _keyword_matcher: Optional[KeywordMatcher] = None
 
     @classmethod
     def _get_gemini_model(cls):
@@ -130,15 +146,165 @@ class AIService:
         if not description:
             return ExpenseCategory.MISCELLANEOUS
         
+        # Local model when it is confident, then Gemini, then keyword matching
+        return (
+            local_categorizer.categorize(description)
+            or cls._gemini_categorize_transaction(description, amount)
+            or cls._fallback_categorize_transaction(description)
+        )
+
+    @classmethod
+    async def categorize_transaction_cached(cls, db: AsyncSession, description: str, amount: float = None) -> ExpenseCategory:
+        """
+        categorize_transaction behind the persistent category cache: known merchants are answered
+        without a Gemini call, and new Gemini answers are stored in the caller's transaction
+        (local-model and keyword answers are not cached, so a later Gemini call can still improve them)
+        """
+        category, _ = await cls.categorize_transaction_with_source(db, description, amount)
+        return category
+
+    @classmethod
+    async def categorize_transaction_with_source(
+        cls, db: AsyncSession, description: str, amount: float = None
+    ) -> Tuple[ExpenseCategory, CategorySource]:
+        """categorize_transaction_cached, plus where the category came from (cache hits count as AI)"""
+        if not description:
+            return ExpenseCategory.MISCELLANEOUS, CategorySource.DEFAULT
+        
+        cached = await category_cache.get(db, description)
+        if cached is not None:
+            return cached, CategorySource.AI
+        
+        local = local_categorizer.categorize(description)
+        if local is not None:
+            return local, CategorySource.LOCAL
+        
+        # Concurrent misses are coalesced into one Gemini prompt (off the event loop)
+        category = await categorization_batcher.categorize(description, amount)
+        if category is None:
+            return cls._fallback_categorize_transaction(description), CategorySource.KEYWORDS
+        
+        await category_cache.put(db, description, category)
+        return category, CategorySource.AI
+
+    @classmethod
+    async def categorize_transactions_cached(
+        cls, db: AsyncSession, descriptions: List[str]
+    ) -> Tuple[List[Tuple[ExpenseCategory, CategorySource]], int]:
+        """
+        Categorize many descriptions at once: duplicates (by normalized description) are resolved
+        once, from the category cache, then the local model, and everything still unknown goes to
+        Gemini in a single prompt. Returns (category, source) per description and the Gemini calls made;
+        sources match categorize_transaction_with_source (cache hits count as AI)
+        """
+        keys = [category_cache.normalize(description or "") for description in descriptions]
+        resolved: Dict[str, Tuple[ExpenseCategory, CategorySource]] = {}
+        
+        cached = await category_cache.get_many(db, descriptions)
+        for key, category in cached.items():
+            resolved[key] = (category, CategorySource.AI)
+        
+        # First description seen for each key still unresolved
+        pending: Dict[str, str] = {}
+        for description, key in zip(descriptions, keys):
+            if key and key not in resolved and key not in pending:
+                local = local_categorizer.categorize(description)
+                if local is not None:
+                    resolved[key] = (local, CategorySource.LOCAL)
+                else:
+                    pending[key] = description
+        
+        ai_calls = 0
+        if pending:
+            answers = await run_in_threadpool(cls._gemini_categorize_batch, list(pending.values()))
+            if answers is not None:
+                ai_calls = 1
+                learned = {}
+                for (key, description), category in zip(pending.items(), answers):
+                    if category is not None:
+                        resolved[key] = (category, CategorySource.AI)
+                        learned[description] = category
+                await category_cache.put_many(db, learned)
+        
+        results = [
+            resolved.get(key) or (
+                (cls._fallback_categorize_transaction(description), CategorySource.KEYWORDS) if description
+                else (ExpenseCategory.MISCELLANEOUS, CategorySource.DEFAULT)
+            )
+            for description, key in zip(descriptions, keys)
+        ]
+        return results, ai_calls
+
+    @classmethod
+    def _gemini_categorize_batch(
+        cls, descriptions: List[str], amounts: Optional[List[Optional[float]]] = None
+    ) -> Optional[List[Optional[ExpenseCategory]]]:
+        """
+        Categorize descriptions (with optional amounts) in one Gemini call; a category (or None if
+        unusable) per description, or None when no call could be made or the answer can't be lined up
+        """
+        if not cls._reserve_api_call():
+            logger.info("Using fallback categorization due to rate limiting")
+            return None
+        
+        try:
+            model = cls._get_gemini_model()
+            if not model:
+                cls._release_api_call()
+                return None
+            
+            amounts = amounts or [None] * len(descriptions)
+            numbered = "\n".join(
+                f"{index}. {json.dumps(description)}" + (f" (amount ${amount})" if amount else "")
+                for index, (description, amount) in enumerate(zip(descriptions, amounts), 1)
+            )
+            prompt = f"""
+            Categorize each of these {len(descriptions)} transactions into one of these categories:
+            {', '.join([cat.value for cat in ExpenseCategory])}
+            
+            Transactions:
+            {numbered}
+            
+            Respond with ONLY a JSON object of the form {{"categories": ["FOOD_DINING", ...]}}
+            holding exactly one category name per transaction, in the same order.
+            Consider the context and merchant type carefully.
+            """
+            
+            response = model.generate_content(prompt)
+        except Exception as e:
+            cls._release_api_call()  # Only successful calls count
+            logger.warning(f"Gemini batch categorization failed, using fallback: {e}")
+            return None
+        
+        try:
+            names = list(json.loads(cls._clean_json_response(response.text))["categories"])
+        except Exception as e:
+            logger.warning(f"Could not parse Gemini batch categories, using fallback: {e}")
+            return None
+        
+        # A skipped or extra entry shifts every answer after it, so a miscounted list is unusable
+        if len(names) != len(descriptions):
+            logger.warning(
+                f"Gemini returned {len(names)} categories for {len(descriptions)} transactions, using fallback"
+            )
+            return None
+        
+        valid = {category.value: category for category in ExpenseCategory}
+        return [valid.get(str(name).strip().upper()) for name in names]
+
+    @classmethod
+    def _gemini_categorize_transaction(cls, description: str, amount: float = None) -> Optional[ExpenseCategory]:
+        """Ask Gemini for a category; None when rate limited, unavailable or the answer is not a category"""
         # Check if we can make API call
-        if not cls._can_make_api_call():
+        if not cls._reserve_api_call():
             logger.info("Using fallback categorization due to rate limiting")
-            return cls._fallback_categorize_transaction(description)
+            return None
         
-        # Try Gemini categorization first
         try:
             model = cls._get_gemini_model()
-            if model:
+            if not model:
+                cls._release_api_call()
+            else:
                 prompt = f"""
                 Categorize this transaction into one of these categories:
                 {', '.join([cat.value for cat in ExpenseCategory])}
@@ -150,8 +316,11 @@ class AIService:
                 Consider the context and merchant type carefully.
                 """
                 
-                response = model.generate_content(prompt)
-                cls._record_api_call()  # Record successful API call
+                try:
+                    response = model.generate_content(prompt)
+                except Exception:
+                    cls._release_api_call()  # Only successful calls count
+                    raise
                 category_name = response.text.strip().upper()
                 
                 # Validate response
@@ -161,8 +330,7 @@ class AIService:
         except Exception as e:
             logger.warning(f"Gemini categorization failed, using fallback: {e}")
         
-        # Fallback to keyword matching
-        return cls._fallback_categorize_transaction(description)
+        return None
 
     @classmethod
     def _fallback_categorize_transaction(cls, description: str) -> ExpenseCategory:
@@ -170,26 +338,9 @@ class AIService:
         if not description:
             return ExpenseCategory.MISCELLANEOUS
         
-        description_lower = description.lower()
-        category_scores = {}
-        
-        for category, keywords in cls.CATEGORY_KEYWORDS.items():
-            score = 0
-            for keyword in keywords:
-                if keyword.lower() in description_lower:
-                    if keyword.lower() == description_lower:
-                        score += 10
-                    else:
-                        score += 1
-            
-            if score > 0:
-                category_scores[category] = score
-        
-        if category_scores:
-            best_category = max(category_scores.items(), key=lambda x: x[1])[0]
-            return best_category
-        
-        return ExpenseCategory.MISCELLANEOUS
+        if cls._keyword_matcher is None:
+            cls._keyword_matcher = KeywordMatcher(cls.CATEGORY_KEYWORDS)
+        return cls._keyword_matcher.categorize(description)
 
     @classmethod
     def generate_enhanced_analysis(
@@ -482,7 +633,7 @@ RESPONSE FORMAT: Start immediately with {{ and end with }}. NO OTHER TEXT ALLOWE
         """Process receipt/document using Gemini Vision for OCR and transaction extraction"""
         
         try:
-            if not cls._can_make_api_call():
+            if not cls._reserve_api_call():
                 return OCRResult(
                     transactions=[],
                     total_amount=Decimal('0'),
@@ -492,7 +643,6 @@ RESPONSE FORMAT: Start immediately with {{ and end with }}. NO OTHER TEXT ALLOWE
                     warnings=["Daily API limit reached, please try again later"]
                 )
                 
-            cls._record_api_call()
             model = genai.GenerativeModel('gemini-1.5-flash')
             
             # Determine file type and process accordingly
@@ -1065,4 +1215,12 @@ CRITICAL INSTRUCTIONS:
                 user_spending[category] = user_spending.get(category, 0) + t.get('amount', 0)
         
         analysis = cls._generate_basic_analysis(user_spending, daily_budget, [], transactions, period_days)
-        return [insight.description for insight in analysis.insights] 
\ No newline at end of file
+        return [insight.description for insight in analysis.insights] 
+
+
+# Coalesces concurrent cache-miss categorizations into one Gemini prompt per window
+categorization_batcher = CategorizationBatcher(
+    lambda descriptions, amounts: AIService._gemini_categorize_batch(descriptions, amounts),
+    window=settings.categorization_batch_window_ms / 1000,
+    max_batch=settings.categorization_batch_max_size
+)
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import database
+from config import settings
+from models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Computes a cached value from a database session
+Compute = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class AnalyticsCache:
+    """
+    In-process LRU cache for per-user analytics, keyed by (user, endpoint, params) and
+    validated against the user's data_version, which every transaction/goal/profile write bumps.
+    A value is fresh for `ttl` seconds; for a further `stale_ttl` seconds it is still served
+    while one background task recomputes it (stale-while-revalidate). A version change is always a miss.
+    With primary_session_factory set (read replicas configured), values are only computed on a
+    replica that has caught up with the user's data_version, and on the primary otherwise.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        stale_ttl: float,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        primary_session_factory: Optional[Callable[[], AsyncSession]] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.session_factory = session_factory
+        self.primary_session_factory = primary_session_factory
+        self._entries: OrderedDict[Hashable, Tuple[int, float, Any]] = OrderedDict()
+        self._refreshing: set = set()
+        self._tasks: set = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refresh_errors = 0
+        self.lagging_reads = 0
+    
+    async def get_or_compute(
+        self, user: User, endpoint: str, params: Dict[str, Any], db: AsyncSession, compute: Compute
+    ) -> Any:
+        """Return the cached value for the user's current data version, computing it on a miss"""
+        if self.max_entries <= 0:
+            return await self._compute_current(user.id, user.data_version, db, compute)
+        
+        key = (user.id, endpoint, tuple(sorted(params.items())))
+        version = user.data_version
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        
+        if entry is not None and entry[0] == version:
+            age = now - entry[1]
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                if age < self.ttl:
+                    self.hits += 1
+                else:
+                    self.stale_hits += 1
+                    self._revalidate(key, version, compute)
+                return entry[2]
+        
+        self.misses += 1
+        value = await self._compute_current(user.id, version, db, compute)
+        self._store(key, version, value)
+        return value
+    
+    async def _compute_current(self, user_id: Hashable, version: int, db: AsyncSession, compute: Compute) -> Any:
+        """
+        Compute on db when its copy of the user is at least at `version` (read from the primary),
+        otherwise on the primary, so a lagging replica never fills an entry for the current version
+        """
+        if self.primary_session_factory is None:
+            return await compute(db)
+        # Replicas replay in order, so everything read after this is at least as new
+        replica_version = await db.scalar(select(User.data_version).where(User.id == user_id))
+        if replica_version is not None and replica_version >= version:
+            return await compute(db)
+        self.lagging_reads += 1
+        async with self.primary_session_factory() as primary:
+            return await compute(primary)
+    
+    def _store(self, key: Hashable, version: int, value: Any):
+        """Insert or replace an entry, evicting the least recently used beyond max_entries"""
+        current = self._entries.get(key)
+        if current is not None and current[0] > version:
+            return  # A newer version was stored meanwhile
+        self._entries[key] = (version, time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def _revalidate(self, key: Hashable, version: int, compute: Compute):
+        """Recompute a stale entry in the background, at most once at a time per key"""
+        if key in self._refreshing or self.session_factory is None:
+            return
+        self._refreshing.add(key)
+        
+        async def refresh():
+            try:
+                async with self.session_factory() as db:
+                    self._store(key, version, await self._compute_current(key[0], version, db, compute))
+            except Exception as e:
+                self.refresh_errors += 1
+                logger.warning(f"Analytics cache refresh failed for {key[1]}: {e}")
+            finally:
+                self._refreshing.discard(key)
+        
+        task = asyncio.create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    def clear(self):
+        """Drop every cached entry"""
+        self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and occupancy"""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "refreshing": len(self._refreshing),
+            "refresh_errors": self.refresh_errors,
+            "lagging_reads": self.lagging_reads
+        }
+
+
+def _read_session() -> AsyncSession:
+    """Session for background refreshes, on a replica when one is configured"""
+    return database.AsyncSessionLocal(reader=database.pick_read_engine())
+
+
+def _primary_session() -> AsyncSession:
+    """Session whose reads see every committed write (the primary, or its own SQLite reader pool)"""
+    return database.AsyncSessionLocal()
+
+
+analytics_cache = AnalyticsCache(
+    max_entries=settings.analytics_cache_max_entries,
+    ttl=settings.analytics_cache_ttl,
+    stale_ttl=settings.analytics_cache_stale_ttl,
+    session_factory=_read_session,
+    # Only replicas can lag behind the data_version read from the primary
+    primary_session_factory=_primary_session if database.replica_engines else None
+)
@@ -0,0 +1,234 @@
+from decimal import Decimal
+from datetime import date, timedelta
+from typing import Dict, List, Tuple, Any, Callable, Optional
+import uuid
+
+from sqlalchemy import select, delete, update, func, cast, literal_column, String, Date
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.user import User
+from models.transaction import Transaction, TransactionType, ExpenseCategory
+from models.daily_total import DailyUserCategoryTotal
+
+# (user_id, date, type, category value or "") -> (amount delta, count delta)
+RollupKey = Tuple[uuid.UUID, date, TransactionType, str]
+RollupDeltas = Dict[RollupKey, Tuple[Decimal, int]]
+
+# Time-series bucket sizes
+INTERVALS = ("day", "week", "month")
+
+
+class AnalyticsRollup:
+    """Maintain and read the daily_user_category_totals rollup"""
+    
+    @staticmethod
+    def add_delta(
+        deltas: RollupDeltas, user_id: uuid.UUID, day: date, transaction_type: TransactionType,
+        category: Optional[ExpenseCategory], amount: Decimal, count: int = 1
+    ) -> RollupDeltas:
+        """Accumulate one transaction's effect (use negative amount/count to remove it)"""
+        key = (user_id, day, transaction_type, category.value if category else "")
+        total, rows = deltas.get(key, (Decimal(0), 0))
+        deltas[key] = (total + amount, rows + count)
+        return deltas
+    
+    @classmethod
+    def deltas_for_rows(cls, user_id: uuid.UUID, rows: List[Dict[str, Any]]) -> RollupDeltas:
+        """Rollup deltas for a batch of inserted transaction rows"""
+        deltas = {}
+        for row in rows:
+            cls.add_delta(deltas, user_id, row["date"], row["type"], row["category"], row["amount"])
+        return deltas
+    
+    @staticmethod
+    async def apply(db: AsyncSession, deltas: RollupDeltas) -> None:
+        """Upsert the deltas in one INSERT ... ON CONFLICT DO UPDATE, inside the caller's transaction"""
+        values = [
+            {"user_id": user_id, "date": day, "type": transaction_type, "category": category, "total": total, "count": count}
+            for (user_id, day, transaction_type, category), (total, count) in deltas.items()
+            if total or count
+        ]
+        if not values:
+            return
+        
+        dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        statement = dialect_insert(DailyUserCategoryTotal)
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "date", "type", "category"],
+            set_={
+                "total": DailyUserCategoryTotal.total + statement.excluded.total,
+                "count": DailyUserCategoryTotal.count + statement.excluded.count
+            }
+        )
+        await db.execute(statement, values)
+    
+    @staticmethod
+    async def totals(db: AsyncSession, user_id: uuid.UUID, start_date: date, end_date: date) -> List[DailyUserCategoryTotal]:
+        """Rollup rows for a user and date range (at most days x types x categories rows)"""
+        result = await db.execute(
+            select(DailyUserCategoryTotal).where(
+                DailyUserCategoryTotal.user_id == user_id,
+                DailyUserCategoryTotal.date >= start_date,
+                DailyUserCategoryTotal.date <= end_date,
+                DailyUserCategoryTotal.count > 0
+            )
+        )
+        return list(result.scalars().all())
+    
+    @staticmethod
+    async def daily_sums(db: AsyncSession, user_id: uuid.UUID, start_date: date, end_date: date) -> List[Any]:
+        """(date, type, total, count) per day with activity, summed in SQL"""
+        result = await db.execute(
+            select(
+                DailyUserCategoryTotal.date, DailyUserCategoryTotal.type,
+                func.sum(DailyUserCategoryTotal.total).label("total"),
+                func.sum(DailyUserCategoryTotal.count).label("count")
+            )
+            .where(
+                DailyUserCategoryTotal.user_id == user_id,
+                DailyUserCategoryTotal.date >= start_date,
+                DailyUserCategoryTotal.date <= end_date
+            )
+            .group_by(DailyUserCategoryTotal.date, DailyUserCategoryTotal.type)
+            .having(func.sum(DailyUserCategoryTotal.count) > 0)
+        )
+        return result.all()
+    
+    @staticmethod
+    async def category_sums(
+        db: AsyncSession, user_id: uuid.UUID, start_date: date, end_date: date, include_uncategorized: bool = False
+    ) -> List[Any]:
+        """(category, total, count) for expenses, summed in SQL, largest first ("" = uncategorized)"""
+        total = func.sum(DailyUserCategoryTotal.total)
+        query = (
+            select(
+                DailyUserCategoryTotal.category,
+                total.label("total"),
+                func.sum(DailyUserCategoryTotal.count).label("count")
+            )
+            .where(
+                DailyUserCategoryTotal.user_id == user_id,
+                DailyUserCategoryTotal.type == TransactionType.EXPENSE,
+                DailyUserCategoryTotal.date >= start_date,
+                DailyUserCategoryTotal.date <= end_date
+            )
+            .group_by(DailyUserCategoryTotal.category)
+            .having(func.sum(DailyUserCategoryTotal.count) > 0)
+            .order_by(total.desc())
+        )
+        if not include_uncategorized:
+            query = query.where(DailyUserCategoryTotal.category != "")
+        return (await db.execute(query)).all()
+    
+    @staticmethod
+    def period_start(day: date, interval: str) -> date:
+        """First day of the bucket containing day (weeks start on Monday)"""
+        if interval == "week":
+            return day - timedelta(days=day.weekday())
+        if interval == "month":
+            return day.replace(day=1)
+        return day
+    
+    @staticmethod
+    def next_period(start: date, interval: str) -> date:
+        """First day of the bucket after the one starting at start"""
+        if interval == "week":
+            return start + timedelta(days=7)
+        if interval == "month":
+            return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+        return start + timedelta(days=1)
+    
+    @staticmethod
+    def _period_column(db: AsyncSession, interval: str):
+        """SQL expression for the bucket start of the rollup date, per dialect"""
+        if interval not in INTERVALS:
+            raise ValueError(f"Unknown interval: {interval}")
+        column = DailyUserCategoryTotal.date
+        if interval == "day":
+            return column
+        if db.get_bind().dialect.name == "postgresql":
+            # Literal unit so the select list and GROUP BY share one identical expression
+            return cast(func.date_trunc(literal_column(f"'{interval}'"), column), Date)
+        # SQLite: step back to Monday / the 1st with date modifiers
+        modifiers = ("-6 days", "weekday 1") if interval == "week" else ("start of month",)
+        return func.date(column, *modifiers, type_=Date)
+    
+    @classmethod
+    async def period_sums(
+        cls, db: AsyncSession, user_id: uuid.UUID, start_date: date, end_date: date,
+        interval: str = "day", by_category: bool = False
+    ) -> List[Any]:
+        """(period, type[, category], total, count) per day/week/month bucket, grouped in SQL"""
+        period = cls._period_column(db, interval).label("period")
+        columns = [period, DailyUserCategoryTotal.type]
+        if by_category:
+            columns.append(DailyUserCategoryTotal.category)
+        result = await db.execute(
+            select(
+                *columns,
+                func.sum(DailyUserCategoryTotal.total).label("total"),
+                func.sum(DailyUserCategoryTotal.count).label("count")
+            )
+            .where(
+                DailyUserCategoryTotal.user_id == user_id,
+                DailyUserCategoryTotal.date >= start_date,
+                DailyUserCategoryTotal.date <= end_date
+            )
+            .group_by(*columns)
+            .having(func.sum(DailyUserCategoryTotal.count) > 0)
+        )
+        return result.all()
+    
+    @staticmethod
+    def rebuild_statements(user_ids: Optional[List[uuid.UUID]] = None) -> List[Any]:
+        """
+        DELETE and INSERT ... SELECT rebuilding the rollup from transactions (every user when user_ids is None),
+        and a data_version bump so analytics cached (and ETagged) from the old rollup are not served again
+        """
+        # Literal '' so the select list and GROUP BY share one identical expression
+        category = func.coalesce(cast(Transaction.category, String), literal_column("''"))
+        clear = delete(DailyUserCategoryTotal)
+        bump = update(User).values(data_version=User.data_version + 1)
+        sums = (
+            select(
+                Transaction.user_id, Transaction.date, Transaction.type, category,
+                func.sum(Transaction.amount), func.count(Transaction.id)
+            )
+            .group_by(Transaction.user_id, Transaction.date, Transaction.type, category)
+        )
+        if user_ids is not None:
+            clear = clear.where(DailyUserCategoryTotal.user_id.in_(user_ids))
+            sums = sums.where(Transaction.user_id.in_(user_ids))
+            bump = bump.where(User.id.in_(user_ids))
+        return [
+            clear,
+            DailyUserCategoryTotal.__table__.insert().from_select(
+                ["user_id", "date", "type", "category", "total", "count"], sums
+            ),
+            bump
+        ]
+    
+    @classmethod
+    async def backfill(cls, session_factory: Callable[[], AsyncSession], batch_size: int = 500) -> int:
+        """Rebuild the rollup from transactions, batch_size users per transaction; returns users processed"""
+        last_id = None
+        processed = 0
+        
+        while True:
+            async with session_factory() as db:
+                query = select(User.id).order_by(User.id).limit(batch_size)
+                if last_id is not None:
+                    query = query.where(User.id > last_id)
+                user_ids = list((await db.execute(query)).scalars().all())
+                if not user_ids:
+                    break
+                
+                for statement in cls.rebuild_statements(user_ids):
+                    await db.execute(statement)
+                await db.commit()
+                
+                processed += len(user_ids)
+                last_id = user_ids[-1]
+        
+        return processed
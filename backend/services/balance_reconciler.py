@@ -0,0 +1,101 @@
+from decimal import Decimal
+from typing import Dict, List, Tuple, Any, Callable, Optional
+import logging
+import uuid
+
+from sqlalchemy import select, update, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.user import User
+from models.transaction import Transaction, TransactionType
+
+logger = logging.getLogger(__name__)
+
+
+class BalanceReconciler:
+    """Recompute balances from the transaction ledger in SQL and repair drift"""
+    
+    # Net effect of the ledger: SUM(CASE WHEN type = 'income' THEN amount ELSE -amount END), exact decimal
+    LEDGER_BALANCE = func.coalesce(
+        func.sum(case((Transaction.type == TransactionType.INCOME, Transaction.amount), else_=-Transaction.amount)),
+        0
+    )
+    
+    @classmethod
+    async def ledger_totals(cls, db: AsyncSession, user_ids: List[uuid.UUID]) -> Dict[uuid.UUID, Tuple[Decimal, int]]:
+        """Ledger balance and transaction count per user, in one grouped query"""
+        result = await db.execute(
+            select(Transaction.user_id, cls.LEDGER_BALANCE, func.count(Transaction.id))
+            .where(Transaction.user_id.in_(user_ids))
+            .group_by(Transaction.user_id)
+        )
+        return {user_id: (Decimal(balance), count) for user_id, balance, count in result.all()}
+    
+    @classmethod
+    def repair_statement(cls, user_ids: Optional[List[uuid.UUID]] = None):
+        """
+        UPDATE resetting stored balances and counts to the ledger (every user when user_ids is None)
+        The totals are correlated subqueries, so writes that commit first are never overwritten
+        """
+        ledger = select(cls.LEDGER_BALANCE).where(Transaction.user_id == User.id).scalar_subquery()
+        count = select(func.count(Transaction.id)).where(Transaction.user_id == User.id).scalar_subquery()
+        statement = update(User).values(current_amount=ledger, transaction_count=count, data_version=User.data_version + 1)
+        if user_ids is not None:
+            statement = statement.where(User.id.in_(user_ids))
+        return statement
+    
+    @classmethod
+    async def repair(cls, db: AsyncSession, user_ids: List[uuid.UUID]) -> Dict[uuid.UUID, Tuple[Decimal, int]]:
+        """Reset stored balances and counts to the ledger in a single UPDATE"""
+        result = await db.execute(
+            cls.repair_statement(user_ids)
+            .returning(User.id, User.current_amount, User.transaction_count)
+            .execution_options(synchronize_session=False)
+        )
+        return {user_id: (balance, transaction_count) for user_id, balance, transaction_count in result.all()}
+    
+    @classmethod
+    async def reconcile_all(
+        cls, session_factory: Callable[[], AsyncSession], batch_size: int = 500, repair: bool = True
+    ) -> Dict[str, Any]:
+        """Walk every user in id order, batch_size at a time, and report (or repair) drift"""
+        last_id = None
+        checked = 0
+        drifted = 0
+        total_drift = Decimal(0)
+        
+        while True:
+            async with session_factory() as db:
+                query = select(User.id, User.current_amount, User.transaction_count).order_by(User.id).limit(batch_size)
+                if last_id is not None:
+                    query = query.where(User.id > last_id)
+                users = (await db.execute(query)).all()
+                if not users:
+                    break
+                
+                totals = await cls.ledger_totals(db, [user.id for user in users])
+                drifted_ids = []
+                for user in users:
+                    ledger_balance, ledger_count = totals.get(user.id, (Decimal(0), 0))
+                    if user.current_amount != ledger_balance or user.transaction_count != ledger_count:
+                        drifted_ids.append(user.id)
+                        total_drift += ledger_balance - user.current_amount
+                        logger.warning(
+                            f"Balance drift for user {user.id}: stored {user.current_amount} / {user.transaction_count} "
+                            f"transactions, ledger {ledger_balance} / {ledger_count}"
+                        )
+                
+                if drifted_ids and repair:
+                    await cls.repair(db, drifted_ids)
+                    await db.commit()
+                
+                checked += len(users)
+                drifted += len(drifted_ids)
+                last_id = users[-1].id
+        
+        return {
+            "users_checked": checked,
+            "users_drifted": drifted,
+            "total_drift": total_drift,
+            "repaired": repair
+        }
@@ -48,7 +48,7 @@ class BudgetCalculator:
                     temp_date = temp_date.replace(year=temp_date.year + 1, month=1, day=1)
                 else:
                     temp_date = temp_date.replace(month=temp_date.month + 1, day=1)
-                    
+            
             total_income_by_deadline = monthly_income * months_until_deadline
             total_available = current_amount + total_income_by_deadline
             
@@ -160,11 +160,6 @@ class BudgetCalculator:
         # Calculate totals
         total_income = sum(t.amount for t in transactions if t.type == TransactionType.INCOME)
         total_expenses = sum(t.amount for t in transactions if t.type == TransactionType.EXPENSE)
-        net_change = total_income - total_expenses
-        
-        # Calculate average daily expense
-        days_in_period = (end_date - start_date).days + 1
-        average_daily_expense = total_expenses / days_in_period if days_in_period > 0 else Decimal(0)
         
         # Category breakdown
         category_breakdown = {}
@@ -173,6 +168,25 @@ class BudgetCalculator:
                 category = transaction.category.value
                 category_breakdown[category] = category_breakdown.get(category, 0) + float(transaction.amount)
         
+        return BudgetCalculator.analyze_spending_totals(
+            total_income, total_expenses, category_breakdown, start_date, end_date
+        )
+    
+    @staticmethod
+    def analyze_spending_totals(
+        total_income: Decimal,
+        total_expenses: Decimal,
+        category_breakdown: Dict[str, float],
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, Any]:
+        """Build the spending analysis from already summed totals"""
+        net_change = total_income - total_expenses
+        
+        # Calculate average daily expense
+        days_in_period = (end_date - start_date).days + 1
+        average_daily_expense = total_expenses / days_in_period if days_in_period > 0 else Decimal(0)
+        
         # Generate insights
         insights = []
         if category_breakdown:
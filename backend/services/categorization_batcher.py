@@ -0,0 +1,105 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from models.transaction import ExpenseCategory
+from services.category_cache import CategoryCache
+
+logger = logging.getLogger(__name__)
+
+# Categorizes (descriptions, amounts) in one blocking call: a category or None per description,
+# or None when no call could be made
+BatchCategorize = Callable[[List[str], List[Optional[float]]], Optional[List[Optional[ExpenseCategory]]]]
+
+
+class CategorizationBatcher:
+    """
+    Coalesces concurrent categorization requests: the first request opens a window of `window`
+    seconds, everything arriving meanwhile (up to max_batch) joins it, and the whole batch is
+    answered by one categorize_batch call whose results are fanned back to the waiting callers.
+    Requests for the same normalized description share one slot in the prompt.
+    """
+    
+    def __init__(self, categorize_batch: BatchCategorize, window: float, max_batch: int):
+        self.categorize_batch = categorize_batch
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[str, Optional[float], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self.requests = 0
+        self.batches = 0
+        self.unanswered = 0
+    
+    async def categorize(self, description: str, amount: Optional[float] = None) -> Optional[ExpenseCategory]:
+        """Category for one description from the next batch (None if the batch call gave none)"""
+        self.requests += 1
+        if self.window <= 0 or self.max_batch <= 1:
+            self.batches += 1
+            return (await self._call([description], [amount]))[0]
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((description, amount, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+    
+    def _flush(self):
+        """Close the current window and answer its requests in the background"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        
+        task = asyncio.create_task(self._answer(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _answer(self, batch: List[Tuple[str, Optional[float], asyncio.Future]]):
+        """One categorize_batch call for the distinct descriptions, results fanned out to callers"""
+        slots: Dict[str, int] = {}
+        descriptions: List[str] = []
+        amounts: List[Optional[float]] = []
+        for description, amount, _ in batch:
+            key = CategoryCache.normalize(description) or description
+            if key not in slots:
+                slots[key] = len(descriptions)
+                descriptions.append(description)
+                amounts.append(amount)
+        
+        self.batches += 1
+        answers = await self._call(descriptions, amounts)
+        for description, _, future in batch:
+            if not future.done():  # The caller may have gone away
+                future.set_result(answers[slots[CategoryCache.normalize(description) or description]])
+    
+    async def _call(self, descriptions: List[str], amounts: List[Optional[float]]) -> List[Optional[ExpenseCategory]]:
+        """Run the blocking batch call off the event loop; all None on failure"""
+        try:
+            answers = await run_in_threadpool(self.categorize_batch, descriptions, amounts)
+        except Exception as e:
+            logger.warning(f"Batched categorization failed: {e}")
+            answers = None
+        if answers is None:
+            self.unanswered += 1
+            return [None] * len(descriptions)
+        return answers
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Requests, batches and the average batch size"""
+        return {
+            "window_ms": round(self.window * 1000, 3),
+            "max_batch": self.max_batch,
+            "requests": self.requests,
+            "batches": self.batches,
+            "average_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "unanswered_batches": self.unanswered,
+            "pending": len(self._pending)
+        }
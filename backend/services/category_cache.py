@@ -0,0 +1,138 @@
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models.transaction import ExpenseCategory
+from models.category_cache import CategoryCacheEntry
+
+MAX_KEY_LENGTH = 255
+
+# Digits, punctuation and underscores separate words; apostrophes are dropped ("trader joe's")
+_NON_WORD = re.compile(r"[\W\d_]+")
+
+
+class CategoryCache:
+    """
+    Categories the AI assigned to transaction descriptions, keyed by normalized description
+    (so "STARBUCKS #1234" and "Starbucks 0042" share one entry). An in-memory LRU sits in
+    front of the category_cache table, which every worker shares and which survives restarts.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ExpenseCategory]" = OrderedDict()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.stores = 0
+    
+    @staticmethod
+    def normalize(description: str) -> str:
+        """Lowercased words without numbers or punctuation ("" when nothing is left)"""
+        text = _NON_WORD.sub(" ", description.casefold().replace("'", ""))
+        return " ".join(text.split())[:MAX_KEY_LENGTH].rstrip()
+    
+    async def get(self, db: AsyncSession, description: str) -> Optional[ExpenseCategory]:
+        """Cached category for a description, from memory or the database"""
+        key = self.normalize(description or "")
+        if not key:
+            return None
+        
+        category = self._entries.get(key)
+        if category is not None:
+            self._entries.move_to_end(key)
+            self.memory_hits += 1
+            return category
+        
+        category = await db.scalar(select(CategoryCacheEntry.category).where(CategoryCacheEntry.key == key))
+        if category is None:
+            self.misses += 1
+            return None
+        self.db_hits += 1
+        self._remember(key, category)
+        return category
+    
+    async def get_many(self, db: AsyncSession, descriptions: List[str]) -> Dict[str, ExpenseCategory]:
+        """Cached categories by normalized key, with one database query for the keys not in memory"""
+        found = {}
+        missing = set()
+        for description in descriptions:
+            key = self.normalize(description or "")
+            if not key or key in found or key in missing:
+                continue
+            category = self._entries.get(key)
+            if category is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                found[key] = category
+            else:
+                missing.add(key)
+        
+        if missing:
+            result = await db.execute(
+                select(CategoryCacheEntry.key, CategoryCacheEntry.category).where(CategoryCacheEntry.key.in_(missing))
+            )
+            for key, category in result.all():
+                self.db_hits += 1
+                self._remember(key, category)
+                found[key] = category
+            self.misses += len(missing) - sum(1 for key in missing if key in found)
+        return found
+    
+    async def put(self, db: AsyncSession, description: str, category: ExpenseCategory) -> None:
+        """Store a category in memory and upsert it in the caller's transaction"""
+        await self.put_many(db, {description: category})
+    
+    async def put_many(self, db: AsyncSession, categories: Dict[str, ExpenseCategory]) -> None:
+        """Store description -> category pairs in memory and upsert them in one statement"""
+        values = {}
+        for description, category in categories.items():
+            key = self.normalize(description or "")
+            if key:
+                values[key] = category
+        if not values:
+            return
+        for key, category in values.items():
+            self._remember(key, category)
+        self.stores += len(values)
+        
+        dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        statement = dialect_insert(CategoryCacheEntry)
+        await db.execute(
+            statement.on_conflict_do_update(index_elements=["key"], set_={"category": statement.excluded.category}),
+            [{"key": key, "category": category} for key, category in values.items()]
+        )
+    
+    def _remember(self, key: str, category: ExpenseCategory):
+        """Insert into the LRU, evicting the least recently used beyond max_entries"""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = category
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop every in-memory entry (the table is kept)"""
+        self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and occupancy"""
+        lookups = self.memory_hits + self.db_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.db_hits) / lookups, 4) if lookups else 0.0,
+            "stores": self.stores
+        }
+
+
+category_cache = CategoryCache(max_entries=settings.category_cache_max_entries)
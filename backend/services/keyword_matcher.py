@@ -0,0 +1,70 @@
+import re
+from typing import Dict, List, Tuple
+
+from models.transaction import ExpenseCategory
+
+
+class KeywordMatcher:
+    """
+    Keyword categorizer compiled into one regex, scoring every category in a single pass.
+    Keywords match at the start of a word ("shop" matches "shopping" but "gas" no longer
+    matches "vegas"). Each keyword found scores 1 for its category, or 10 when it is the whole
+    description; the highest score wins, ties going to the category listed first.
+    """
+
+    def __init__(self, keywords: Dict[ExpenseCategory, List[str]]):
+        self._order = {category: index for index, category in enumerate(keywords)}
+        categories_by_keyword: Dict[str, List[ExpenseCategory]] = {}
+        for category, words in keywords.items():
+            for word in words:
+                categories_by_keyword.setdefault(word.lower(), []).append(category)
+
+        # The keywords as a trie-shaped regex: each word start is matched in one walk that
+        # yields the longest keyword there; every other keyword starting there is a prefix of it
+        ordered = sorted(categories_by_keyword, key=len, reverse=True)
+        # (the leading character class lets most positions fail before the trie is tried)
+        first_chars = re.escape("".join(sorted({word[0] for word in ordered})))
+        self._pattern = re.compile(r"\b(?=[" + first_chars + r"])(?=(" + self._trie_pattern(ordered) + "))")
+        self._categories = categories_by_keyword
+        self._prefixes: Dict[str, Tuple[str, ...]] = {
+            word: tuple(other for other in ordered if word.startswith(other))
+            for word in ordered
+        }
+
+    @classmethod
+    def _trie_pattern(cls, words: List[str]) -> str:
+        """Regex matching the longest of `words` that starts at the current position"""
+        branches: Dict[str, List[str]] = {}
+        ends_here = False
+        for word in words:
+            if word:
+                branches.setdefault(word[0], []).append(word[1:])
+            else:
+                ends_here = True
+        if not branches:
+            return ""
+        alternatives = [re.escape(char) + cls._trie_pattern(rest) for char, rest in sorted(branches.items())]
+        pattern = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+        # Greedy optional tail: prefer the longer keyword, settle for the one ending here
+        return "(?:" + pattern + ")?" if ends_here else pattern
+
+    def scores(self, description: str) -> Dict[ExpenseCategory, int]:
+        """Score per category with at least one keyword in the description"""
+        text = description.lower()
+        found = {word for longest in self._pattern.findall(text) for word in self._prefixes[longest]}
+
+        scores: Dict[ExpenseCategory, int] = {}
+        for word in found:
+            points = 10 if word == text else 1
+            for category in self._categories[word]:
+                scores[category] = scores.get(category, 0) + points
+        return scores
+
+    def categorize(self, description: str) -> ExpenseCategory:
+        """Best-scoring category, or MISCELLANEOUS when no keyword matches"""
+        if not description:
+            return ExpenseCategory.MISCELLANEOUS
+        scores = self.scores(description)
+        if not scores:
+            return ExpenseCategory.MISCELLANEOUS
+        return max(scores, key=lambda category: (scores[category], -self._order[category]))
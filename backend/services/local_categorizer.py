@@ -0,0 +1,310 @@
+import itertools
+import logging
+import os
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models.transaction import Transaction, ExpenseCategory, CategorySource
+from services.category_cache import CategoryCache
+
+logger = logging.getLogger(__name__)
+
+# Hashed feature space (2^18 buckets x 14 categories of float32 is ~15MB)
+N_FEATURES = 1 << 18
+# Additive smoothing for the naive Bayes likelihoods
+ALPHA = 0.1
+# Seconds between checks for a retrained model file
+RELOAD_INTERVAL = 60.0
+# Featurized rows accumulated per bincount during training
+TRAIN_CHUNK_ROWS = 50000
+# Share of a description's words that must have been seen in training (its first word always must)
+MIN_SEEN_WORDS = 0.5
+# Holdout transactions that must be answered before a confidence threshold is trusted
+MIN_CALIBRATION_ANSWERS = 50
+# Stored categories worth learning from (not defaults, keyword guesses or this model's own answers)
+TRUSTED_SOURCES = (CategorySource.USER.value, CategorySource.AI.value)
+
+# (description, category, number of transactions with that pair)
+TrainingRow = Tuple[str, ExpenseCategory, int]
+
+
+class LocalCategorizer:
+    """
+    Multinomial naive Bayes over hashed word, word-pair and character-trigram features of the
+    normalized description, trained offline (python manage.py train-categorizer) on the
+    user- and Gemini-assigned categories stored in transactions. Naive Bayes posteriors are
+    near 1 even for merchants it has never seen, so it refuses descriptions whose words it has
+    not seen in training, and answers only at or above the confidence that reached the target
+    accuracy on the training holdout (never below min_confidence); otherwise the caller moves on to Gemini.
+    """
+    
+    def __init__(self, path: str, min_confidence: float):
+        self.path = path
+        self.min_confidence = min_confidence
+        self._model: Optional[Dict[str, np.ndarray]] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = float("-inf")
+        self.confident = 0
+        self.uncertain = 0
+        self.unknown = 0
+    
+    @staticmethod
+    def _hash(tokens: Iterable[str]) -> np.ndarray:
+        """Hashed feature ids for tokens, in order"""
+        return np.array([zlib.crc32(token.encode()) & (N_FEATURES - 1) for token in tokens], dtype=np.int64)
+    
+    @classmethod
+    def featurize(cls, description: str) -> np.ndarray:
+        """Unique hashed feature ids for a description (empty when nothing survives normalization)"""
+        words = CategoryCache.normalize(description or "").split()
+        tokens = set(words)
+        tokens.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+        for word in words:
+            padded = f"<{word}>"
+            tokens.update("#" + padded[i:i + 3] for i in range(len(padded) - 2))
+        return np.unique(cls._hash(tokens))
+    
+    @classmethod
+    def fit(cls, rows: Iterable[TrainingRow]) -> Dict[str, np.ndarray]:
+        """Train on (description, category, count) rows; counts weight repeated descriptions"""
+        classes = list(ExpenseCategory)
+        class_index = {category: index for index, category in enumerate(classes)}
+        feature_counts = np.zeros(len(classes) * N_FEATURES, dtype=np.float64)
+        class_counts = np.zeros(len(classes), dtype=np.float64)
+        
+        flat_ids: List[np.ndarray] = []
+        weights: List[np.ndarray] = []
+        
+        def flush():
+            if flat_ids:
+                feature_counts[:] += np.bincount(
+                    np.concatenate(flat_ids), weights=np.concatenate(weights), minlength=feature_counts.size
+                )
+                flat_ids.clear()
+                weights.clear()
+        
+        for description, category, count in rows:
+            features = cls.featurize(description)
+            if not features.size:
+                continue
+            label = class_index[category]
+            class_counts[label] += count
+            flat_ids.append(features + label * N_FEATURES)
+            weights.append(np.full(features.size, count, dtype=np.float64))
+            if len(flat_ids) >= TRAIN_CHUNK_ROWS:
+                flush()
+        flush()
+        
+        if not class_counts.sum():
+            raise ValueError("No categorized transactions to train on")
+        
+        feature_counts = feature_counts.reshape(len(classes), N_FEATURES)
+        smoothed = feature_counts + ALPHA
+        return {
+            "classes": np.array([category.value for category in classes]),
+            "class_log_prior": np.log((class_counts + ALPHA) / (class_counts.sum() + ALPHA * len(classes))),
+            "feature_log_prob": (np.log(smoothed) - np.log(smoothed.sum(axis=1, keepdims=True))).astype(np.float32),
+            "seen": feature_counts.sum(axis=0) > 0,
+            # Replaced by the holdout-calibrated threshold in train_from_database
+            "min_confidence": np.array(np.inf)
+        }
+    
+    @classmethod
+    def predict_with(cls, model: Dict[str, np.ndarray], description: str) -> Optional[Tuple[ExpenseCategory, float]]:
+        """
+        Most likely category and its posterior probability, or None without features or when the
+        description's first word or most of its words were never seen in training
+        """
+        words = CategoryCache.normalize(description or "").split()
+        if not words:
+            return None
+        # Trigrams are shared by almost every merchant; whole words tell a new merchant apart
+        seen = model["seen"]
+        words_seen = seen[cls._hash(words)]
+        if not words_seen[0] or words_seen.mean() < MIN_SEEN_WORDS:
+            return None
+        
+        # Unseen features carry no evidence, only smoothing that favours the smallest categories
+        features = cls.featurize(description)
+        features = features[seen[features]]
+        scores = model["class_log_prior"] + model["feature_log_prob"][:, features].sum(axis=1)
+        probabilities = np.exp(scores - scores.max())
+        probabilities /= probabilities.sum()
+        best = int(probabilities.argmax())
+        return ExpenseCategory(str(model["classes"][best])), float(probabilities[best])
+    
+    @staticmethod
+    def save(model: Dict[str, np.ndarray], path: str):
+        """Write the model atomically so running workers never load a partial file"""
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as file:
+            np.savez(file, **model)
+        os.replace(temporary, path)
+    
+    def _current_model(self) -> Optional[Dict[str, np.ndarray]]:
+        """The loaded model, reloaded when the file on disk has been retrained"""
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_INTERVAL:
+            return self._model
+        self._checked_at = now
+        
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            self._model = None
+            return None
+        if mtime != self._mtime:
+            try:
+                with np.load(self.path) as data:
+                    model = {name: data[name] for name in data.files}
+                self._mtime = mtime
+                if "seen" in model and "min_confidence" in model:
+                    self._model = model
+                    logger.info(f"Loaded local categorizer from {self.path}")
+                else:
+                    self._model = None
+                    logger.warning(f"Local categorizer {self.path} predates calibration; retrain it")
+            except Exception as e:
+                logger.warning(f"Failed to load local categorizer {self.path}: {e}")
+        return self._model
+    
+    def predict(self, description: str) -> Optional[Tuple[ExpenseCategory, float]]:
+        """Prediction and confidence, or None when no model is trained or the description is unknown"""
+        model = self._current_model()
+        if model is None:
+            return None
+        return self.predict_with(model, description)
+    
+    def threshold(self, model: Dict[str, np.ndarray]) -> float:
+        """Confidence needed to answer: the holdout-calibrated threshold, at least min_confidence"""
+        return max(float(model["min_confidence"]), self.min_confidence)
+    
+    def categorize(self, description: str) -> Optional[ExpenseCategory]:
+        """Category when the model knows the description and is confident enough, else None"""
+        model = self._current_model()
+        if model is None:
+            return None
+        prediction = self.predict_with(model, description)
+        if prediction is None:
+            self.unknown += 1
+            return None
+        category, confidence = prediction
+        if confidence < self.threshold(model):
+            self.uncertain += 1
+            return None
+        self.confident += 1
+        return category
+    
+    @staticmethod
+    def calibrate(predictions: List[Tuple[float, bool, int]], target_accuracy: float) -> float:
+        """
+        Lowest confidence at which the holdout answers at or above it were at least target_accuracy
+        correct, from (confidence, correct, transactions) per answered description; inf when none was
+        """
+        threshold = float("inf")
+        answered = correct = 0
+        ranked = sorted(predictions, key=lambda prediction: -prediction[0])
+        for confidence, group in itertools.groupby(ranked, key=lambda prediction: prediction[0]):
+            for _, is_correct, count in group:
+                answered += count
+                correct += count if is_correct else 0
+            if answered >= MIN_CALIBRATION_ANSWERS and correct / answered >= target_accuracy:
+                threshold = confidence
+        return threshold
+    
+    @staticmethod
+    async def training_rows(db: AsyncSession) -> List[TrainingRow]:
+        """
+        Distinct (description, category) pairs with their transaction counts, grouped in SQL.
+        MISCELLANEOUS (the default) is never learned; rows from before category_source was
+        recorded are kept only where the keyword fallback would not have chosen the same category.
+        """
+        from services.ai_service import AIService
+        
+        count = func.count(Transaction.id)
+        legacy = Transaction.category_source.is_(None)
+        result = await db.stream(
+            select(Transaction.description, Transaction.category, count, legacy)
+            .where(
+                Transaction.category.is_not(None),
+                Transaction.category != ExpenseCategory.MISCELLANEOUS,
+                Transaction.description.is_not(None),
+                or_(legacy, Transaction.category_source.in_(TRUSTED_SOURCES))
+            )
+            .group_by(Transaction.description, Transaction.category, legacy)
+            .execution_options(yield_per=10000)
+        )
+        return [
+            (description, category, rows)
+            async for description, category, rows, is_legacy in result
+            if not (is_legacy and AIService._fallback_categorize_transaction(description) == category)
+        ]
+    
+    @classmethod
+    async def train_from_database(
+        cls,
+        session_factory: Callable[[], AsyncSession],
+        path: str,
+        min_confidence: float,
+        target_accuracy: float,
+        holdout: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Hold out every holdout-th normalized description (what the category cache keys on, so the
+        holdout looks like the cache misses this model sees), calibrate the confidence threshold on
+        it, then train on all rows and save
+        Returns row counts, the threshold, and holdout accuracy/coverage at that threshold
+        """
+        async with session_factory() as db:
+            rows = await cls.training_rows(db)
+        
+        def is_holdout(row: TrainingRow) -> bool:
+            return zlib.crc32(CategoryCache.normalize(row[0]).encode()) % holdout == 0
+        
+        evaluation = cls.fit(row for row in rows if not is_holdout(row))
+        predictions = []
+        total = 0
+        for description, category, count in filter(is_holdout, rows):
+            prediction = cls.predict_with(evaluation, description)
+            total += count
+            if prediction:
+                predictions.append((prediction[1], prediction[0] == category, count))
+        
+        calibrated = cls.calibrate(predictions, target_accuracy)
+        threshold = max(calibrated, min_confidence)
+        answered = sum(count for confidence, _, count in predictions if confidence >= threshold)
+        correct = sum(count for confidence, is_correct, count in predictions if confidence >= threshold and is_correct)
+        
+        model = cls.fit(rows)
+        model["min_confidence"] = np.array(calibrated)
+        cls.save(model, path)
+        return {
+            "descriptions": len(rows),
+            "transactions": sum(row[2] for row in rows),
+            "min_confidence": threshold,
+            "holdout_transactions": total,
+            "holdout_coverage": round(answered / total, 4) if total else 0.0,
+            "holdout_accuracy": round(correct / answered, 4) if answered else 0.0
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Whether a model is loaded, its threshold, and how often it answered"""
+        return {
+            "loaded": self._model is not None,
+            "min_confidence": self.threshold(self._model) if self._model is not None else self.min_confidence,
+            "confident": self.confident,
+            "uncertain": self.uncertain,
+            "unknown": self.unknown
+        }
+
+
+local_categorizer = LocalCategorizer(
+    path=settings.local_categorizer_path,
+    min_confidence=settings.local_categorizer_min_confidence
+)
@@ -0,0 +1,279 @@
+import csv
+import codecs
+import itertools
+import re
+from decimal import Decimal, InvalidOperation
+from datetime import date, datetime
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple
+
+from models.transaction import TransactionType, ExpenseCategory
+from schemas.ai import OCRTransactionItem
+
+# One parsed statement entry: (line or entry number, item, error message)
+ParsedEntry = Tuple[int, Optional[OCRTransactionItem], Optional[str]]
+
+
+class StatementParser:
+    """Incremental parser for bank statement exports (CSV, OFX/QFX)"""
+    
+    READ_SIZE = 64 * 1024
+    
+    # Header names banks commonly use, matched case-insensitively
+    DATE_COLUMNS = ("date", "transaction date", "posted date", "posting date", "booking date", "value date")
+    DESCRIPTION_COLUMNS = ("description", "transaction description", "payee", "name", "merchant", "details", "narrative", "memo")
+    AMOUNT_COLUMNS = ("amount", "transaction amount", "value")
+    DEBIT_COLUMNS = ("debit", "debit amount", "withdrawal", "withdrawals", "money out", "paid out")
+    CREDIT_COLUMNS = ("credit", "credit amount", "deposit", "deposits", "money in", "paid in")
+    TYPE_COLUMNS = ("type", "transaction type")
+    CATEGORY_COLUMNS = ("category",)
+    
+    DATE_FORMATS = (
+        "%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d", "%d-%m-%Y", "%m-%d-%Y",
+        "%d.%m.%Y", "%m/%d/%y", "%d %b %Y", "%b %d, %Y", "%Y%m%d"
+    )
+    INCOME_TYPES = ("income", "credit", "cr", "deposit")
+    EXPENSE_TYPES = ("expense", "debit", "dr", "withdrawal", "payment")
+    
+    OFX_TAG = re.compile(r"^(/?)([A-Za-z0-9.]+)>(.*)$", re.DOTALL)
+    
+    @classmethod
+    def detect_format(cls, filename: Optional[str], content_type: Optional[str]) -> str:
+        """Guess the statement format from the upload's file name or content type"""
+        name = (filename or "").lower()
+        if name.endswith((".ofx", ".qfx")) or "ofx" in (content_type or ""):
+            return "ofx"
+        return "csv"
+    
+    @classmethod
+    def parse(cls, stream: BinaryIO, statement_format: str, date_format: Optional[str] = None) -> Iterator[ParsedEntry]:
+        """Yield statement entries one at a time without reading the whole file"""
+        if statement_format in ("ofx", "qfx"):
+            return cls.parse_ofx(stream)
+        return cls.parse_csv(stream, date_format)
+    
+    @classmethod
+    def parse_csv(cls, stream: BinaryIO, date_format: Optional[str] = None) -> Iterator[ParsedEntry]:
+        """Parse a CSV export with a header row (raises ValueError if the columns are unrecognised)"""
+        sample = stream.read(8192)
+        stream.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample.decode("utf-8-sig", errors="replace"), delimiters=",;\t|")
+        except csv.Error:
+            dialect = csv.excel
+        
+        reader = csv.reader(codecs.getreader("utf-8-sig")(stream, errors="replace"), dialect)
+        header = next(reader, None)
+        if not header:
+            raise ValueError("Statement is empty")
+        columns = cls._map_columns(header)
+        
+        if not date_format:
+            # One format for the whole file, decided from its date column before any row is yielded
+            index = columns["date"]
+            date_format = cls.detect_date_format(
+                row[index].strip() for row in reader if index < len(row) and row[index].strip()
+            )
+            stream.seek(0)
+            reader = csv.reader(codecs.getreader("utf-8-sig")(stream, errors="replace"), dialect)
+            next(reader, None)
+        
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            try:
+                yield reader.line_num, cls._csv_item(row, columns, date_format), None
+            except (ValueError, IndexError) as e:
+                yield reader.line_num, None, str(e)
+    
+    @classmethod
+    def _map_columns(cls, header) -> dict:
+        """Locate the columns we understand in a CSV header row"""
+        names = [cell.strip().lower() for cell in header]
+        
+        def find(candidates):
+            for candidate in candidates:
+                if candidate in names:
+                    return names.index(candidate)
+            return None
+        
+        columns = {
+            "date": find(cls.DATE_COLUMNS),
+            "description": find(cls.DESCRIPTION_COLUMNS),
+            "amount": find(cls.AMOUNT_COLUMNS),
+            "debit": find(cls.DEBIT_COLUMNS),
+            "credit": find(cls.CREDIT_COLUMNS),
+            "type": find(cls.TYPE_COLUMNS),
+            "category": find(cls.CATEGORY_COLUMNS)
+        }
+        if columns["date"] is None:
+            raise ValueError("No date column found in CSV header")
+        if columns["amount"] is None and columns["debit"] is None and columns["credit"] is None:
+            raise ValueError("No amount, debit or credit column found in CSV header")
+        return columns
+    
+    @classmethod
+    def _csv_item(cls, row, columns: dict, date_format: Optional[str]) -> OCRTransactionItem:
+        """Build one transaction from a CSV row"""
+        def cell(name):
+            index = columns[name]
+            return row[index].strip() if index is not None and index < len(row) else ""
+        
+        if columns["amount"] is not None and cell("amount"):
+            amount = cls.parse_amount(cell("amount"))
+        else:
+            # Separate debit/credit columns: money out is negative
+            debit = cls.parse_amount(cell("debit")) if cell("debit") else Decimal(0)
+            credit = cls.parse_amount(cell("credit")) if cell("credit") else Decimal(0)
+            amount = abs(credit) - abs(debit)
+        
+        transaction_type = TransactionType.INCOME if amount > 0 else TransactionType.EXPENSE
+        declared_type = cell("type").lower()
+        if declared_type in cls.INCOME_TYPES:
+            transaction_type = TransactionType.INCOME
+        elif declared_type in cls.EXPENSE_TYPES:
+            transaction_type = TransactionType.EXPENSE
+        
+        return OCRTransactionItem(
+            description=cell("description") or "Imported transaction",
+            amount=abs(amount),
+            date=cls.parse_date(cell("date"), date_format),
+            type=transaction_type,
+            category=cls.parse_category(cell("category")) if transaction_type == TransactionType.EXPENSE else None,
+            confidence=1.0
+        )
+    
+    @classmethod
+    def parse_ofx(cls, stream: BinaryIO) -> Iterator[ParsedEntry]:
+        """Parse OFX 1.x (SGML) or 2.x (XML) statements, one <STMTTRN> block at a time"""
+        reader = codecs.getreader("utf-8")(stream, errors="replace")
+        buffer = ""
+        current = None
+        number = 0
+        
+        while True:
+            chunk = reader.read(cls.READ_SIZE)
+            buffer += chunk
+            tokens = buffer.split("<")
+            # Keep the trailing token until we know it is complete
+            buffer = tokens.pop() if chunk else ""
+            
+            for token in tokens:
+                match = cls.OFX_TAG.match(token)
+                if not match:
+                    continue
+                closing, tag, value = match.group(1), match.group(2).upper(), match.group(3).strip()
+                
+                if tag == "STMTTRN":
+                    if current is not None:
+                        number += 1
+                        yield cls._ofx_entry(number, current)
+                    current = None if closing else {}
+                elif current is not None and not closing:
+                    current[tag] = value
+            
+            if not chunk:
+                break
+        
+        if current is not None:
+            number += 1
+            yield cls._ofx_entry(number, current)
+    
+    @classmethod
+    def _ofx_entry(cls, number: int, fields: dict) -> ParsedEntry:
+        """Build one transaction from the fields of an OFX <STMTTRN> block"""
+        try:
+            amount = cls.parse_amount(fields.get("TRNAMT", ""))
+            transaction_type = TransactionType.INCOME if amount > 0 else TransactionType.EXPENSE
+            if amount == 0 and fields.get("TRNTYPE", "").lower() in cls.INCOME_TYPES:
+                transaction_type = TransactionType.INCOME
+            
+            posted = fields.get("DTPOSTED", "")[:8]
+            description = fields.get("NAME") or fields.get("MEMO") or "Imported transaction"
+            item = OCRTransactionItem(
+                description=description,
+                amount=abs(amount),
+                date=datetime.strptime(posted, "%Y%m%d").date(),
+                type=transaction_type,
+                confidence=1.0
+            )
+            return number, item, None
+        except ValueError as e:
+            return number, None, str(e)
+    
+    @staticmethod
+    def parse_amount(raw: str) -> Decimal:
+        """Parse a bank amount such as '-1,234.56', '(12.00)', '$5', '12.00 DR' or '1.234,56'"""
+        text = raw.strip().upper()
+        negative = text.startswith("-") or text.endswith("-") or (text.startswith("(") and text.endswith(")"))
+        if text.endswith("DR"):
+            negative = True
+        
+        digits = re.sub(r"[^0-9.,]", "", text)
+        if "," in digits and (digits.rfind(",") > digits.rfind(".")) and len(digits) - digits.rfind(",") == 3:
+            # Decimal comma: 1.234,56
+            digits = digits.replace(".", "").replace(",", ".")
+        else:
+            digits = digits.replace(",", "")
+        
+        try:
+            value = Decimal(digits)
+        except InvalidOperation:
+            raise ValueError(f"Invalid amount: {raw}")
+        return -value if negative else value
+    
+    @staticmethod
+    def _try_date(raw: str, fmt: str) -> Optional[date]:
+        """The date raw (or its part before a time) holds in fmt, or None"""
+        for candidate in (raw, raw.split(" ")[0], raw.split("T")[0]):
+            try:
+                return datetime.strptime(candidate, fmt).date()
+            except ValueError:
+                continue
+        return None
+    
+    @classmethod
+    def detect_date_format(cls, dates: Iterable[str]) -> Optional[str]:
+        """
+        The common format that parses every date in a file (rows no format parses are left to fail
+        on their own), or None when no date fits any. Raises ValueError when formats that read the
+        same dates differently both fit (e.g. MM/DD and DD/MM with no day above 12)
+        """
+        candidates = list(cls.DATE_FORMATS)
+        conflicts = set()
+        for raw in dates:
+            readings = {fmt: cls._try_date(raw, fmt) for fmt in candidates}
+            if not any(readings.values()):
+                continue
+            candidates = [fmt for fmt in candidates if readings[fmt] is not None]
+            for first, second in itertools.combinations(candidates, 2):
+                if readings[first] != readings[second]:
+                    conflicts.add((first, second))
+            if len(candidates) == 1:
+                return candidates[0]
+        
+        if len(candidates) == len(cls.DATE_FORMATS):
+            return None
+        for first, second in conflicts:
+            if first in candidates and second in candidates:
+                raise ValueError(
+                    f"Ambiguous dates: they read differently as {first} and {second}; pass date_format"
+                )
+        return candidates[0]
+    
+    @classmethod
+    def parse_date(cls, raw: str, date_format: Optional[str] = None) -> date:
+        """Parse a statement date with the given format, or the first common format that fits"""
+        for fmt in (date_format,) if date_format else cls.DATE_FORMATS:
+            parsed = cls._try_date(raw, fmt)
+            if parsed is not None:
+                return parsed
+        raise ValueError(f"Invalid date: {raw}")
+    
+    @staticmethod
+    def parse_category(raw: str) -> Optional[ExpenseCategory]:
+        """Map a category cell onto an ExpenseCategory when it names one"""
+        name = re.sub(r"[^A-Z]+", "_", raw.upper()).strip("_")
+        try:
+            return ExpenseCategory(name)
+        except ValueError:
+            return None
@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import Row
+
+from models.transaction import Transaction
+
+# Columns written to every export, in order
+EXPORT_COLUMNS = (
+    Transaction.id, Transaction.date, Transaction.type, Transaction.category,
+    Transaction.amount, Transaction.description, Transaction.created_at
+)
+
+
+class ExportSink:
+    """Write-only file object that hands back what was written so far, keeping tell() absolute"""
+    
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+    
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self.position
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+    
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class TransactionExporter:
+    """Serialize streamed transaction rows to CSV, NDJSON or Parquet one batch at a time"""
+    
+    MEDIA_TYPES = {
+        "csv": "text/csv",
+        "ndjson": "application/x-ndjson",
+        "parquet": "application/vnd.apache.parquet"
+    }
+    
+    @staticmethod
+    def _values(row: Row) -> list:
+        """Plain values for one exported row (enums as their values)"""
+        transaction_id, day, transaction_type, category, amount, description, created_at = row
+        return [
+            str(transaction_id), day, transaction_type.value, category.value if category else None,
+            amount, description, created_at
+        ]
+    
+    @classmethod
+    async def stream(cls, partitions: AsyncIterator[Sequence[Row]], export_format: str) -> AsyncIterator[bytes]:
+        """Yield the encoded export, one chunk per partition of rows"""
+        if export_format == "parquet":
+            async for chunk in cls._stream_parquet(partitions):
+                yield chunk
+            return
+        
+        if export_format == "csv":
+            yield (",".join(column.key for column in EXPORT_COLUMNS) + "\r\n").encode()
+        
+        async for rows in partitions:
+            if export_format == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows(cls._values(row) for row in rows)
+                yield buffer.getvalue().encode()
+            else:
+                keys = [column.key for column in EXPORT_COLUMNS]
+                yield "".join(
+                    json.dumps(dict(zip(keys, cls._values(row))), default=str) + "\n" for row in rows
+                ).encode()
+    
+    @classmethod
+    async def _stream_parquet(cls, partitions: AsyncIterator[Sequence[Row]]) -> AsyncIterator[bytes]:
+        """Write each partition as a Parquet row group and flush it straight to the client"""
+        # Imported lazily: pyarrow is heavy and only needed for Parquet exports
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        schema = pa.schema([
+            ("id", pa.string()),
+            ("date", pa.date32()),
+            ("type", pa.string()),
+            ("category", pa.string()),
+            ("amount", pa.decimal128(12, 2)),
+            ("description", pa.string()),
+            ("created_at", pa.timestamp("us"))
+        ])
+        sink = ExportSink()
+        writer = pq.ParquetWriter(sink, schema)
+        
+        async for rows in partitions:
+            columns = list(zip(*(cls._values(row) for row in rows)))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            ))
+            yield sink.drain()
+        
+        writer.close()
+        yield sink.drain()
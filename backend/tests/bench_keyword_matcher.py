@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Keyword categorizer microbenchmark: the per-keyword substring loop the fallback used to run
+against the compiled KeywordMatcher, on synthetic bank/receipt descriptions
+No server or database needed
+Run with: python tests/bench_keyword_matcher.py [--count 1000000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.transaction import ExpenseCategory
+from services.ai_service import AIService
+from services.keyword_matcher import KeywordMatcher
+
+MERCHANTS = [
+    "STARBUCKS", "Uber trip", "UBER EATS", "Walmart Supercenter", "Shell gas station", "Amazon Mktp",
+    "Netflix.com", "Comcast internet bill", "CVS Pharmacy", "Delta Airlines flight", "Planet Fitness gym",
+    "Great Clips haircut", "Red Cross donation", "Office Depot supplies", "Whole Foods Market",
+    "Trader Joes", "Hilton hotel", "Spotify subscription", "Chipotle", "Zelle transfer", "ATM withdrawal",
+    "Las Vegas parking", "Business lunch", "Restore hardware", "Apple Store", "Costco Wholesale"
+]
+
+
+def legacy_categorize(description: str) -> ExpenseCategory:
+    """The substring loop _fallback_categorize_transaction ran before the matcher"""
+    description_lower = description.lower()
+    category_scores = {}
+    for category, keywords in AIService.CATEGORY_KEYWORDS.items():
+        score = 0
+        for keyword in keywords:
+            if keyword.lower() in description_lower:
+                score += 10 if keyword.lower() == description_lower else 1
+        if score > 0:
+            category_scores[category] = score
+    if category_scores:
+        return max(category_scores.items(), key=lambda x: x[1])[0]
+    return ExpenseCategory.MISCELLANEOUS
+
+
+def make_descriptions(count: int) -> list:
+    """Merchant names with store numbers, dates and locations, like card statements"""
+    rng = random.Random(42)
+    return [
+        f"{rng.choice(MERCHANTS)} #{rng.randint(1, 9999)} {rng.randint(1, 12):02d}/{rng.randint(1, 28):02d} CA"
+        for _ in range(count)
+    ]
+
+
+def timed(label: str, func, descriptions: list) -> float:
+    start = time.perf_counter()
+    for description in descriptions:
+        func(description)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:7.2f} s  {len(descriptions) / elapsed:12,.0f} descriptions/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword categorizer microbenchmark")
+    parser.add_argument("--count", type=int, default=1_000_000, help="Descriptions to categorize")
+    args = parser.parse_args()
+
+    descriptions = make_descriptions(args.count)
+    matcher = KeywordMatcher(AIService.CATEGORY_KEYWORDS)
+
+    print(f"📊 Categorizing {args.count:,} descriptions")
+    before = timed("substring loop", legacy_categorize, descriptions)
+    after = timed("compiled matcher", matcher.categorize, descriptions)
+    print(f"  speedup {before / after:.1f}x")
+
+    print("🔍 Results that changed (word-start matching):")
+    for merchant in MERCHANTS:
+        old, new = legacy_categorize(merchant), matcher.categorize(merchant)
+        if old != new:
+            print(f"  {merchant!r}: {old.value} -> {new.value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Response serialization benchmark: FastAPI's default path (response_model re-validation,
+jsonable_encoder, json.dumps) against orjson / direct pydantic JSON, plus compression ratios
+No server or database needed
+Run with: python tests/bench_serialization.py
+"""
+
+import asyncio
+import json
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from api.compression import BrotliEncoder, GzipEncoder
+from api.responses import json_response
+from models.transaction import ExpenseCategory, TransactionType
+from schemas.transaction import TransactionList
+
+ROUNDS = 2000
+
+
+def sample_transaction_list(count: int = 100) -> TransactionList:
+    """A full page of transactions, validated from ORM-like rows as the endpoint does"""
+    user_id = uuid.uuid4()
+    categories = list(ExpenseCategory)
+    rows = [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            amount=Decimal(f"{10 + i}.{i % 100:02d}"),
+            type=TransactionType.EXPENSE,
+            category=categories[i % len(categories)],
+            description=f"Card payment {i} at a local merchant",
+            date=date(2026, 10, 1) + timedelta(days=i % 28),
+            created_at=datetime(2026, 10, 1, 12, 0, 0),
+            updated_at=datetime(2026, 10, 1, 12, 0, 0)
+        )
+        for i in range(count)
+    ]
+    return TransactionList(
+        transactions=rows, total=2500, total_is_estimate=False, page=1, per_page=count, total_pages=25, next_cursor=None
+    )
+
+
+def sample_monthly_report() -> dict:
+    """Monthly report shaped like compute_monthly_report's output"""
+    return {
+        "year": 2026,
+        "month": 10,
+        "period_start": date(2026, 10, 1),
+        "period_end": date(2026, 10, 31),
+        "total_income": 4200.0,
+        "total_expenses": 2875.5,
+        "net_savings": 1324.5,
+        "category_breakdown": {category.value: 100.0 + i for i, category in enumerate(ExpenseCategory)},
+        "insights": ["Your largest expense category is Groceries", "You saved 31.5% of your income"],
+        "daily_breakdown": {day: {"income": 140.0, "expenses": 92.75} for day in range(1, 32)}
+    }
+
+
+def timed(label: str, func) -> float:
+    """Average microseconds per call over ROUNDS calls"""
+    func()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    micros = (time.perf_counter() - start) / ROUNDS * 1e6
+    print(f"  {label:<46} {micros:9.1f} µs")
+    return micros
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    field = create_response_field(name="Response_get_transactions", type_=TransactionList)
+    transactions = sample_transaction_list()
+    report = sample_monthly_report()
+
+    def list_before() -> bytes:
+        content = loop.run_until_complete(serialize_response(field=field, response_content=transactions))
+        return JSONResponse(content).body
+
+    def list_after() -> bytes:
+        return json_response(transactions).body
+
+    def report_before() -> bytes:
+        return JSONResponse(jsonable_encoder(report)).body
+
+    def report_after() -> bytes:
+        return json_response(report).body
+
+    assert json.loads(list_before()) == json.loads(list_after())
+    assert json.loads(report_before()) == json.loads(report_after())
+
+    print(f"📊 Transaction list (100 rows, {len(list_after())} bytes)")
+    before = timed("before: re-validate + dump + json.dumps", list_before)
+    after = timed("after: pydantic to_json", list_after)
+    print(f"  speedup {before / after:.1f}x")
+
+    print(f"📊 Monthly report ({len(report_after())} bytes)")
+    before = timed("before: jsonable_encoder + json.dumps", report_before)
+    after = timed("after: orjson", report_after)
+    print(f"  speedup {before / after:.1f}x")
+
+    body = list_after()
+    print("📦 Compression of the transaction list")
+    for encoder_class in (GzipEncoder, BrotliEncoder):
+        def compress():
+            encoder = encoder_class()
+            return encoder.compress(body) + encoder.finish()
+        size = len(compress())
+        timed(f"{encoder_class.name}: {len(body)} -> {size} bytes ({size / len(body):.0%})", compress)
+
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
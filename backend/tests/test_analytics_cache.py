@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Analytics cache tests (versioning, LRU eviction, stale-while-revalidate)
+Pure in-memory; no server or database needed
+Run with: python -m pytest tests/test_analytics_cache.py
+"""
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from services.analytics_cache import AnalyticsCache
+
+
+def make_user(version: int = 0):
+    return SimpleNamespace(id=uuid.uuid4(), data_version=version)
+
+
+class Counter:
+    """Compute function that counts its calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, db):
+        self.calls += 1
+        return {"calls": self.calls}
+
+
+def test_hit_until_data_version_changes():
+    async def scenario():
+        cache = AnalyticsCache(max_entries=10, ttl=60, stale_ttl=0)
+        user = make_user()
+        compute = Counter()
+
+        assert await cache.get_or_compute(user, "report", {"month": 1}, None, compute) == {"calls": 1}
+        assert await cache.get_or_compute(user, "report", {"month": 1}, None, compute) == {"calls": 1}
+        assert await cache.get_or_compute(user, "report", {"month": 2}, None, compute) == {"calls": 2}
+
+        user.data_version += 1
+        assert await cache.get_or_compute(user, "report", {"month": 1}, None, compute) == {"calls": 3}
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 3
+
+    asyncio.run(scenario())
+
+
+def test_least_recently_used_entry_is_evicted():
+    async def scenario():
+        cache = AnalyticsCache(max_entries=2, ttl=60, stale_ttl=0)
+        user = make_user()
+        compute = Counter()
+
+        await cache.get_or_compute(user, "a", {}, None, compute)
+        await cache.get_or_compute(user, "b", {}, None, compute)
+        await cache.get_or_compute(user, "a", {}, None, compute)  # a is now most recent
+        await cache.get_or_compute(user, "c", {}, None, compute)  # evicts b
+
+        calls = compute.calls
+        await cache.get_or_compute(user, "a", {}, None, compute)
+        assert compute.calls == calls
+        await cache.get_or_compute(user, "b", {}, None, compute)
+        assert compute.calls == calls + 1
+        assert cache.get_stats()["evictions"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_stale_entry_is_served_while_refreshing():
+    @asynccontextmanager
+    async def session_factory():
+        yield None
+
+    async def scenario():
+        cache = AnalyticsCache(max_entries=10, ttl=0, stale_ttl=60, session_factory=session_factory)
+        user = make_user()
+        compute = Counter()
+
+        assert await cache.get_or_compute(user, "report", {}, None, compute) == {"calls": 1}
+        # Past ttl: the stale value comes back immediately and a refresh runs in the background
+        assert await cache.get_or_compute(user, "report", {}, None, compute) == {"calls": 1}
+        await asyncio.gather(*cache._tasks)
+        assert compute.calls == 2
+        assert cache.get_stats()["stale_hits"] == 1
+
+    asyncio.run(scenario())
+
+
+class FakeSession:
+    """Stands in for a session whose copy of the user is at `version`"""
+
+    def __init__(self, name: str, version: int):
+        self.name = name
+        self.version = version
+
+    async def scalar(self, statement):
+        return self.version
+
+
+def test_lagging_replica_is_not_cached_under_the_current_version():
+    primary = FakeSession("primary", 5)
+
+    @asynccontextmanager
+    async def primary_factory():
+        yield primary
+
+    async def compute(db):
+        return db.name
+
+    async def scenario():
+        cache = AnalyticsCache(max_entries=10, ttl=60, stale_ttl=0, primary_session_factory=primary_factory)
+        user = make_user(version=5)
+
+        # The replica has not replayed the write yet: the primary answers and that is what gets cached
+        assert await cache.get_or_compute(user, "report", {}, FakeSession("replica", 4), compute) == "primary"
+        assert await cache.get_or_compute(user, "report", {}, FakeSession("replica", 5), compute) == "primary"
+        assert cache.get_stats()["lagging_reads"] == 1
+
+        # A caught-up replica serves the next version itself
+        user.data_version = 6
+        assert await cache.get_or_compute(user, "report", {}, FakeSession("replica", 6), compute) == "replica"
+
+    asyncio.run(scenario())
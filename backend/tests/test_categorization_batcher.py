@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Categorization batcher tests (coalescing concurrent requests, size cap, failures, rate limit)
+Pure in-memory; no server, database or Gemini key needed
+Run with: python -m pytest tests/test_categorization_batcher.py
+"""
+
+import asyncio
+import threading
+import time
+
+from models.transaction import ExpenseCategory
+from services.ai_service import AIService
+from services.categorization_batcher import CategorizationBatcher
+
+
+class FakeGemini:
+    """Batch categorize function that records each call"""
+
+    def __init__(self, answer=ExpenseCategory.SHOPPING, fail=False):
+        self.calls = []
+        self.answer = answer
+        self.fail = fail
+
+    def __call__(self, descriptions, amounts):
+        self.calls.append(list(descriptions))
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        time.sleep(0.01)  # A real call blocks for a while
+        return [self.answer for _ in descriptions]
+
+
+def test_concurrent_requests_share_one_call():
+    gemini = FakeGemini()
+    batcher = CategorizationBatcher(gemini, window=0.02, max_batch=100)
+
+    async def scenario():
+        descriptions = [f"Target #{i}" for i in range(20)] + ["Best Buy 1", "BEST BUY 2"]
+        return await asyncio.gather(*(batcher.categorize(d) for d in descriptions))
+
+    results = asyncio.run(scenario())
+    assert results == [ExpenseCategory.SHOPPING] * 22
+    # Duplicates by normalized description take one slot: "target" and "best buy"
+    assert gemini.calls == [["Target #0", "Best Buy 1"]]
+    assert batcher.get_stats()["average_batch_size"] == 22
+
+
+def test_full_batch_is_sent_without_waiting():
+    gemini = FakeGemini()
+    batcher = CategorizationBatcher(gemini, window=60, max_batch=3)
+
+    async def scenario():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.categorize(f"{name} store") for name in ("a", "b", "c"))), timeout=5
+        )
+
+    assert len(asyncio.run(scenario())) == 3
+    assert len(gemini.calls) == 1
+
+
+def test_failed_call_answers_none_and_window_zero_calls_directly():
+    gemini = FakeGemini(fail=True)
+    batcher = CategorizationBatcher(gemini, window=0, max_batch=50)
+
+    async def scenario():
+        return await asyncio.gather(batcher.categorize("Lyft ride"), batcher.categorize("Lyft ride"))
+
+    assert asyncio.run(scenario()) == [None, None]
+    assert len(gemini.calls) == 2
+    assert batcher.get_stats()["unanswered_batches"] == 2
+
+
+def test_concurrent_batches_never_exceed_the_daily_limit(monkeypatch):
+    monkeypatch.setattr(AIService, "_daily_api_calls", AIService._max_daily_calls - 5)
+    granted = []
+    start = threading.Barrier(20)
+
+    def worker():
+        start.wait()
+        granted.append(AIService._reserve_api_call())
+
+    threads = [threading.Thread(target=worker) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert granted.count(True) == 5
+    assert AIService._daily_api_calls == AIService._max_daily_calls
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Categorization cache tests (normalization, memory/database tiers, Gemini only on misses, batches)
+A SQLite file stands in for the database; no server or Gemini key needed
+Run with: python -m pytest tests/test_category_cache.py
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import create_sqlite_async_engine
+from models import Base
+from models.transaction import ExpenseCategory, CategorySource
+from services.ai_service import AIService
+from services.category_cache import CategoryCache, category_cache
+
+
+async def make_engine(tmp_path):
+    engine = create_sqlite_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'cache.db'}", pool_size=1)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    return engine
+
+
+def test_normalize_drops_numbers_and_punctuation():
+    assert CategoryCache.normalize("STARBUCKS #1234 Seattle, WA") == "starbucks seattle wa"
+    assert CategoryCache.normalize("Trader Joe's 0042") == "trader joes"
+    assert CategoryCache.normalize("Uber   trip 08/12") == "uber trip"
+    assert CategoryCache.normalize("#123 / 456") == ""
+
+
+def test_entries_survive_a_cold_memory_tier(tmp_path):
+    async def scenario():
+        engine = await make_engine(tmp_path)
+        cache = CategoryCache(max_entries=10)
+        async with AsyncSession(engine) as db:
+            assert await cache.get(db, "Starbucks #1") is None
+            await cache.put(db, "Starbucks #1", ExpenseCategory.FOOD_DINING)
+            await db.commit()
+            assert await cache.get(db, "STARBUCKS #2") == ExpenseCategory.FOOD_DINING
+
+            # A fresh worker only has the table
+            cold = CategoryCache(max_entries=10)
+            assert await cold.get(db, "starbucks") == ExpenseCategory.FOOD_DINING
+            assert await cold.get(db, "starbucks") == ExpenseCategory.FOOD_DINING
+        await engine.dispose()
+
+        assert cache.get_stats()["memory_hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+        assert cold.get_stats()["db_hits"] == 1
+        assert cold.get_stats()["memory_hits"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_gemini_is_only_asked_about_new_merchants(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_gemini_batch(descriptions, amounts=None):
+        calls.extend(descriptions)
+        return [ExpenseCategory.TRAVEL] * len(descriptions)
+
+    monkeypatch.setattr(AIService, "_gemini_categorize_batch", fake_gemini_batch)
+    category_cache.clear()
+
+    async def scenario():
+        engine = await make_engine(tmp_path)
+        async with AsyncSession(engine) as db:
+            for description in ("Marriott 1001", "MARRIOTT 2002", "Marriott #3003"):
+                assert await AIService.categorize_transaction_cached(db, description) == ExpenseCategory.TRAVEL
+            await db.commit()
+        await engine.dispose()
+
+    asyncio.run(scenario())
+    assert calls == ["Marriott 1001"]
+
+
+def test_batch_sends_only_unknown_merchants_in_one_call(tmp_path, monkeypatch):
+    prompts = []
+
+    def fake_gemini_batch(descriptions, amounts=None):
+        prompts.append(descriptions)
+        return [ExpenseCategory.FITNESS if "gym" in d.lower() else None for d in descriptions]
+
+    monkeypatch.setattr(AIService, "_gemini_categorize_batch", fake_gemini_batch)
+    category_cache.clear()
+
+    async def scenario():
+        engine = await make_engine(tmp_path)
+        async with AsyncSession(engine) as db:
+            await category_cache.put(db, "Starbucks", ExpenseCategory.FOOD_DINING)
+            results, ai_calls = await AIService.categorize_transactions_cached(
+                db, ["STARBUCKS #1", "Gold's Gym 01", "GOLDS GYM 02", "Netflix 123", "Starbucks #2"]
+            )
+            await db.commit()
+        await engine.dispose()
+        return results, ai_calls
+
+    results, ai_calls = asyncio.run(scenario())
+    assert ai_calls == 1
+    assert prompts == [["Gold's Gym 01", "Netflix 123"]]
+    assert results == [
+        (ExpenseCategory.FOOD_DINING, CategorySource.AI),
+        (ExpenseCategory.FITNESS, CategorySource.AI),
+        (ExpenseCategory.FITNESS, CategorySource.AI),
+        (ExpenseCategory.ENTERTAINMENT, CategorySource.KEYWORDS),
+        (ExpenseCategory.FOOD_DINING, CategorySource.AI),
+    ]
+
+
+def test_batch_prompt_answer_is_parsed_in_order(monkeypatch):
+    class FakeModel:
+        def generate_content(self, prompt):
+            assert '1. "Hilton Garden Inn"' in prompt and '2. "Mystery charge"' in prompt
+            return SimpleNamespace(text='```json\n{"categories": ["travel", "NOT_A_CATEGORY"]}\n```')
+
+    monkeypatch.setattr(AIService, "_reserve_api_call", classmethod(lambda cls: True))
+    monkeypatch.setattr(AIService, "_get_gemini_model", classmethod(lambda cls: FakeModel()))
+    answers = AIService._gemini_categorize_batch(["Hilton Garden Inn", "Mystery charge"])
+    assert answers == [ExpenseCategory.TRAVEL, None]
+
+
+def test_batch_answer_with_wrong_count_is_not_used(monkeypatch):
+    class FakeModel:
+        def generate_content(self, prompt):
+            # One entry dropped: positions no longer line up with the transactions
+            return SimpleNamespace(text='{"categories": ["TRAVEL", "FOOD_DINING"]}')
+
+    monkeypatch.setattr(AIService, "_reserve_api_call", classmethod(lambda cls: True))
+    monkeypatch.setattr(AIService, "_get_gemini_model", classmethod(lambda cls: FakeModel()))
+    assert AIService._gemini_categorize_batch(["Hilton Garden Inn", "Mystery charge", "Chipotle"]) is None
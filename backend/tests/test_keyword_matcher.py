@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Keyword matcher tests (scoring, overlapping keywords, word-start matching)
+Pure in-memory; no server or database needed
+Run with: python -m pytest tests/test_keyword_matcher.py
+"""
+
+from models.transaction import ExpenseCategory
+from services.ai_service import AIService
+from services.keyword_matcher import KeywordMatcher
+
+matcher = KeywordMatcher(AIService.CATEGORY_KEYWORDS)
+
+
+def test_overlapping_keywords_all_score():
+    # "gas bill" also contains "gas" and "bill"; "uber eats" also contains "uber"
+    assert matcher.scores("Gas bill March") == {
+        ExpenseCategory.TRANSPORTATION: 1, ExpenseCategory.BILLS_UTILITIES: 2
+    }
+    assert matcher.scores("UBER EATS order") == {
+        ExpenseCategory.FOOD_DINING: 1, ExpenseCategory.TRANSPORTATION: 1
+    }
+
+
+def test_exact_description_scores_ten():
+    assert matcher.scores("Rent") == {ExpenseCategory.BILLS_UTILITIES: 10}
+
+
+def test_keywords_match_at_word_starts_only():
+    assert matcher.categorize("Shopping mall #12") == ExpenseCategory.SHOPPING
+    assert matcher.categorize("Las Vegas show") == ExpenseCategory.MISCELLANEOUS
+    assert matcher.categorize("Parent teacher night") == ExpenseCategory.MISCELLANEOUS
+
+
+def test_ties_go_to_the_first_listed_category():
+    keywords = {ExpenseCategory.TRAVEL: ["trip"], ExpenseCategory.TRANSPORTATION: ["uber"]}
+    assert KeywordMatcher(keywords).categorize("uber trip") == ExpenseCategory.TRAVEL
+    assert AIService._fallback_categorize_transaction("") == ExpenseCategory.MISCELLANEOUS
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Local categorizer tests (training, unknown merchants, calibrated threshold, training rows, reload)
+Pure in-memory plus temporary model and SQLite files; no server needed
+Run with: python -m pytest tests/test_local_categorizer.py
+"""
+
+import asyncio
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import create_sqlite_async_engine
+from models import Base, User, Transaction
+from models.transaction import ExpenseCategory, TransactionType, CategorySource
+from services.local_categorizer import LocalCategorizer
+
+ROWS = [
+    ("STARBUCKS #1234 SEATTLE", ExpenseCategory.FOOD_DINING, 40),
+    ("Chipotle Mexican Grill", ExpenseCategory.FOOD_DINING, 25),
+    ("SHELL OIL 5739", ExpenseCategory.TRANSPORTATION, 30),
+    ("Uber trip help.uber.com", ExpenseCategory.TRANSPORTATION, 50),
+    ("Whole Foods Market", ExpenseCategory.GROCERIES, 35),
+    ("Kroger #402", ExpenseCategory.GROCERIES, 20),
+]
+
+
+def test_learns_merchants_from_stored_categories():
+    model = LocalCategorizer.fit(ROWS)
+    category, confidence = LocalCategorizer.predict_with(model, "Starbucks 0042 Portland")
+    assert category == ExpenseCategory.FOOD_DINING
+    assert confidence > 0.9
+    assert LocalCategorizer.predict_with(model, "UBER TRIP 8/12")[0] == ExpenseCategory.TRANSPORTATION
+    assert LocalCategorizer.predict_with(model, "#123 / 456") is None
+
+
+def test_refuses_merchants_it_has_never_seen():
+    model = LocalCategorizer.fit(ROWS)
+    # Plenty of familiar trigrams, but the merchant itself is new
+    for description in ("Delta Air Lines", "Home Depot", "Comcast cable bill", "Apple.com/bill", "Marketplace"):
+        assert LocalCategorizer.predict_with(model, description) is None
+    # Known merchant, but most of the description is new
+    assert LocalCategorizer.predict_with(model, "Kroger fuel center Atlanta") is None
+
+
+def test_threshold_is_the_lowest_confidence_meeting_the_target():
+    predictions = [(0.999, True, 60), (0.99, True, 30), (0.95, False, 5), (0.9, False, 20), (0.8, True, 100)]
+    # 90/90 correct down to 0.99, 90/95 at 0.95, 90/115 at 0.9, 190/215 at 0.8
+    assert LocalCategorizer.calibrate(predictions, target_accuracy=0.97) == 0.99
+    assert LocalCategorizer.calibrate(predictions, target_accuracy=0.88) == 0.8
+    assert LocalCategorizer.calibrate(predictions, target_accuracy=0.99) == 0.99
+    assert LocalCategorizer.calibrate([(0.99, True, 10)], target_accuracy=0.5) == float("inf")  # Too few answers
+
+
+def test_answers_only_when_confident(tmp_path):
+    path = str(tmp_path / "model.npz")
+    categorizer = LocalCategorizer(path, min_confidence=0.5)
+    assert categorizer.categorize("Starbucks") is None  # No model trained yet
+
+    model = LocalCategorizer.fit(ROWS)
+    LocalCategorizer.save(model, path)
+    categorizer._checked_at = float("-inf")  # Skip the reload interval
+    assert categorizer.categorize("Kroger 0017") is None  # Not calibrated: never answers
+
+    model["min_confidence"] = np.array(0.9)
+    LocalCategorizer.save(model, path)
+    categorizer._checked_at = categorizer._mtime = float("-inf")
+    assert categorizer.categorize("Kroger 0017") == ExpenseCategory.GROCERIES
+    assert categorizer.categorize("Zelle payment to John") is None
+    assert categorizer.get_stats() == {
+        "loaded": True, "min_confidence": 0.9, "confident": 1, "uncertain": 1, "unknown": 1
+    }
+
+
+def test_trains_only_on_user_and_ai_categories(tmp_path):
+    def transaction(user_id, description, category, source):
+        return Transaction(
+            user_id=user_id, amount=Decimal("5"), type=TransactionType.EXPENSE, date=date.today(),
+            description=description, category=category, category_source=source and source.value
+        )
+
+    async def scenario():
+        engine = create_sqlite_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'train.db'}", pool_size=1)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as db:
+            user = User(id=uuid.uuid4(), email="train@example.com", name="train", current_amount=Decimal("0"))
+            db.add(user)
+            await db.flush()
+            db.add_all([
+                transaction(user.id, "Blue Bottle Coffee", ExpenseCategory.FOOD_DINING, CategorySource.USER),
+                transaction(user.id, "Hilton Garden Inn", ExpenseCategory.TRAVEL, CategorySource.AI),
+                transaction(user.id, "Mystery vendor", ExpenseCategory.MISCELLANEOUS, CategorySource.USER),
+                transaction(user.id, "Bulk row", ExpenseCategory.MISCELLANEOUS, CategorySource.DEFAULT),
+                transaction(user.id, "Gas n Go", ExpenseCategory.TRANSPORTATION, CategorySource.KEYWORDS),
+                transaction(user.id, "Corner cafe", ExpenseCategory.SHOPPING, CategorySource.LOCAL),
+                # Older rows: kept unless the keyword fallback would have picked the same category
+                transaction(user.id, "Acme Widgets", ExpenseCategory.BUSINESS, None),
+                transaction(user.id, "Netflix.com", ExpenseCategory.ENTERTAINMENT, None),
+            ])
+            await db.commit()
+            rows = await LocalCategorizer.training_rows(db)
+        await engine.dispose()
+        return rows
+
+    rows = asyncio.run(scenario())
+    assert sorted(description for description, _, _ in rows) == [
+        "Acme Widgets", "Blue Bottle Coffee", "Hilton Garden Inn"
+    ]
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Read-replica routing tests
+Two SQLite files stand in for the primary and the replica; no server needed
+Run with: python -m pytest tests/test_replica_routing.py
+"""
+
+import asyncio
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from database import RoutingSession, create_sqlite_async_engine
+from models import Base, User
+
+
+def make_user(name: str) -> User:
+    return User(id=uuid.uuid4(), email=f"{name}@example.com", name=name, current_amount=Decimal("0"))
+
+
+async def setup_databases(tmp_path):
+    primary = create_sqlite_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}", pool_size=1)
+    replica_writer = create_sqlite_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}", pool_size=1)
+    replica = create_sqlite_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}", pool_size=2, read_only=True)
+
+    for target in (primary, replica_writer):
+        async with target.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    # Seed each file with a different user so we can tell which one answered
+    async with AsyncSession(primary) as session:
+        session.add(make_user("primary"))
+        await session.commit()
+    async with AsyncSession(replica_writer) as session:
+        session.add(make_user("replica"))
+        await session.commit()
+    await replica_writer.dispose()
+
+    sessions = async_sessionmaker(
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        writer=primary.sync_engine,
+        reader=replica.sync_engine,
+        expire_on_commit=False
+    )
+    return primary, replica, sessions
+
+
+async def user_names(session) -> set:
+    result = await session.execute(select(User.name))
+    return set(result.scalars().all())
+
+
+def test_reads_go_to_replica(tmp_path):
+    async def scenario():
+        primary, replica, sessions = await setup_databases(tmp_path)
+        async with sessions() as session:
+            assert await user_names(session) == {"replica"}
+        await primary.dispose()
+        await replica.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_writes_go_to_primary_and_read_their_own_changes(tmp_path):
+    async def scenario():
+        primary, replica, sessions = await setup_databases(tmp_path)
+        async with sessions() as session:
+            session.add(make_user("new"))
+            await session.flush()
+            # After writing, the transaction stays on the primary
+            assert await user_names(session) == {"primary", "new"}
+            await session.commit()
+
+            # A fresh transaction goes back to the replica
+            assert await user_names(session) == {"replica"}
+
+        async with AsyncSession(primary) as session:
+            assert await user_names(session) == {"primary", "new"}
+        await primary.dispose()
+        await replica.dispose()
+
+    asyncio.run(scenario())
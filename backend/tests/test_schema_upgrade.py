@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Schema upgrade tests (columns added and backfilled, rollup filled, search index rebuilt at startup)
+A SQLite file stands in for a database created before the upgrade; no server needed
+Run with: python -m pytest tests/test_schema_upgrade.py
+"""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from database import ensure_added_columns, ensure_search_index, upgrade_schema
+from models import Base, User, Transaction, DailyUserCategoryTotal
+from models.transaction import TransactionType, ExpenseCategory
+
+
+def test_missing_columns_are_added_and_backfilled(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(engine)
+    user_id = uuid.uuid4()
+    with Session(engine) as session:
+        # A balance the user set by hand, which the upgrade must not touch
+        session.add(User(id=user_id, email="old@example.com", name="old", current_amount=Decimal("500")))
+        session.flush()
+        for amount, kind in ((Decimal("100"), TransactionType.INCOME), (Decimal("30"), TransactionType.EXPENSE)):
+            session.add(Transaction(user_id=user_id, amount=amount, type=kind, description="x", date=date.today()))
+        session.commit()
+
+    # What an install from before these columns looks like
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE users DROP COLUMN transaction_count"))
+        connection.execute(text("ALTER TABLE users DROP COLUMN data_version"))
+        connection.execute(text("ALTER TABLE transactions DROP COLUMN category_source"))
+
+    for _ in range(2):  # Idempotent: the second startup changes nothing
+        with engine.begin() as connection:
+            ensure_added_columns(connection)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("users")}
+    assert {"transaction_count", "data_version"} <= columns
+    assert "category_source" in {column["name"] for column in inspect(engine).get_columns("transactions")}
+    with Session(engine) as session:
+        user = session.get(User, user_id)
+        assert user.transaction_count == 2
+        assert user.current_amount == Decimal("500")
+        assert user.data_version == 0
+    engine.dispose()
+
+
+def test_search_index_follows_rows_renumbered_by_vacuum(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        ensure_search_index(connection)
+    user_id = uuid.uuid4()
+    with Session(engine) as session:
+        session.add(User(id=user_id, email="fts@example.com", name="fts", current_amount=Decimal("0")))
+        session.flush()
+        for description in ("Deleted row", "Starbucks coffee", "Shell gas station"):
+            session.add(Transaction(
+                user_id=user_id, amount=Decimal("1"), type=TransactionType.EXPENSE,
+                description=description, date=date.today()
+            ))
+        session.commit()
+
+    def search(phrase):
+        with engine.connect() as connection:
+            return connection.execute(text(
+                "SELECT t.description FROM transactions_fts JOIN transactions t ON t.rowid = transactions_fts.rowid "
+                "WHERE transactions_fts MATCH :phrase"
+            ), {"phrase": phrase}).scalars().all()
+
+    # VACUUM may renumber the implicit rowids the index is keyed on; do it explicitly here
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM transactions WHERE description = 'Deleted row'"))
+        connection.execute(text("UPDATE transactions SET rowid = rowid - 1"))
+    assert search('"starbucks"') != ["Starbucks coffee"]
+
+    with engine.begin() as connection:
+        ensure_search_index(connection)  # What the next startup does
+    assert search('"starbucks"') == ["Starbucks coffee"]
+    assert search('"shell"') == ["Shell gas station"]
+    engine.dispose()
+
+
+def test_new_rollup_table_is_filled_from_existing_transactions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'rollup.db'}")
+    Base.metadata.create_all(engine)
+    user_id = uuid.uuid4()
+    with Session(engine) as session:
+        session.add(User(id=user_id, email="rollup@example.com", name="rollup", current_amount=Decimal("0")))
+        session.flush()
+        for amount in (Decimal("12.50"), Decimal("7.50")):
+            session.add(Transaction(
+                user_id=user_id, amount=amount, type=TransactionType.EXPENSE,
+                category=ExpenseCategory.GROCERIES, description="Kroger", date=date(2026, 3, 5)
+            ))
+        session.commit()
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE daily_user_category_totals"))  # A database from before the rollup
+
+    with engine.begin() as connection:
+        upgrade_schema(connection)
+    with engine.begin() as connection:
+        upgrade_schema(connection)  # Already there: left alone
+
+    with Session(engine) as session:
+        rows = session.query(DailyUserCategoryTotal).all()
+        assert [(row.date, row.category, row.total, row.count) for row in rows] == [
+            (date(2026, 3, 5), "GROCERIES", Decimal("20.00"), 2)
+        ]
+        # Analytics cached before the rebuild no longer match
+        assert session.get(User, user_id).data_version == 1
+    engine.dispose()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Statement parser date tests (one date format per file, ambiguous MM/DD vs DD/MM files)
+Pure in-memory; no server or database needed
+Run with: python -m pytest tests/test_statement_parser.py
+"""
+
+import io
+from datetime import date
+
+import pytest
+
+from services.statement_parser import StatementParser
+
+
+def parse_dates(text, date_format=None):
+    entries = StatementParser.parse(io.BytesIO(text.encode()), "csv", date_format)
+    return [item.date if item else error for _, item, error in entries]
+
+
+def test_one_format_is_used_for_the_whole_file():
+    # The second row rules out MM/DD, so the first is read as 5 March, not 3 May
+    assert parse_dates("Date,Description,Amount\n05/03/2026,a,-1\n25/03/2026,b,-2\n") == [
+        date(2026, 3, 5), date(2026, 3, 25)
+    ]
+    assert parse_dates("Date,Description,Amount\n05/03/2026,a,-1\n03/25/2026,b,-2\n") == [
+        date(2026, 5, 3), date(2026, 3, 25)
+    ]
+
+
+def test_ambiguous_files_need_a_date_format():
+    text = "Date,Description,Amount\n05/03/2026,a,-1\n06/04/2026,b,-2\n"
+    with pytest.raises(ValueError, match="Ambiguous dates"):
+        parse_dates(text)
+    assert parse_dates(text, "%d/%m/%Y") == [date(2026, 3, 5), date(2026, 4, 6)]
+
+
+def test_unparseable_rows_fail_on_their_own():
+    assert parse_dates("Date,Description,Amount\n2026-03-05,a,-1\nyesterday,b,-2\n") == [
+        date(2026, 3, 5), "Invalid date: yesterday"
+    ]